@@ -0,0 +1,169 @@
+"""Avaliação em massa de um arquivo com uma expressão por linha.
+
+O arquivo é mapeado em memória (mmap) e dividido em faixas de bytes que
+começam e terminam em fronteiras de linha; cada faixa é avaliada por um
+processo, que tokeniza cada linha direto do mapeamento (a regex do
+AnalisadorLexicoRapido, com as regras do AnalisadorLexico, roda sobre
+bytes), sem criar uma str por linha. Os resultados vão para dois arquivos
+.npy pré-alocados do tamanho do arquivo de entrada: os valores (float64,
+NaN nas linhas com erro) e um bitmap de erros com um bit por linha. A
+memória usada não cresce com o tamanho da entrada.
+
+Uso: python avaliacao_arquivo.py entrada.txt valores.npy erros.npy [--workers N]
+"""
+import argparse
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from compilador import Compilador
+
+# Tamanho dos blocos lidos para contar linhas
+BLOCO = 1 << 24
+NOVA_LINHA = 0x0A
+RETORNO = 0x0D
+
+
+def _contar_linhas(mapa, inicio, fim):
+    total = 0
+    for posicao in range(inicio, fim, BLOCO):
+        total += mapa[posicao:min(posicao + BLOCO, fim)].count(b'\n')
+    return total
+
+
+def dividir(mapa, tamanho_shard):
+    """Divide o arquivo em faixas (inicio, fim, primeira_linha).
+
+    Cada faixa termina numa fronteira de linha e a primeira linha da faixa
+    seguinte tem número múltiplo de 8, então cada processo escreve bytes
+    inteiros do bitmap. Devolve também o total de linhas.
+    """
+    tamanho = len(mapa)
+    faixas = []
+    inicio = linha = 0
+    while inicio < tamanho:
+        fim = min(inicio + tamanho_shard, tamanho)
+        linhas = _contar_linhas(mapa, inicio, fim)
+        while fim < tamanho and (mapa[fim - 1] != NOVA_LINHA or (linha + linhas) % 8):
+            quebra = mapa.find(b'\n', fim)
+            fim = tamanho if quebra < 0 else quebra + 1
+            linhas += quebra >= 0
+        faixas.append((inicio, fim, linha))
+        linha += linhas
+        inicio = fim
+    # Última linha sem '\n' no final
+    if tamanho and mapa[tamanho - 1] != NOVA_LINHA:
+        linha += 1
+    return faixas, linha
+
+
+def erros_por_linha(bitmap, linhas):
+    """Expande o bitmap de erros num array booleano com uma posição por linha"""
+    return np.unpackbits(bitmap, count=linhas, bitorder='little').astype(bool)
+
+
+def _avaliar_faixa(caminho, inicio, fim, primeira_linha, saida_valores, saida_erros, opcoes):
+    valores = np.lib.format.open_memmap(saida_valores, mode='r+')
+    bitmap = np.lib.format.open_memmap(saida_erros, mode='r+')
+    erros = 0
+    with open(caminho, 'rb') as arquivo, \
+            mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        visao = memoryview(mapa)
+        try:
+            indice = primeira_linha
+            bits = 0
+            posicao = inicio
+            while posicao < fim:
+                quebra = mapa.find(b'\n', posicao, fim)
+                fim_linha = fim if quebra < 0 else quebra
+                proxima = fim_linha + 1
+                if fim_linha > posicao and mapa[fim_linha - 1] == RETORNO:
+                    fim_linha -= 1
+
+                # A fatia da memoryview não copia os bytes da linha
+                texto = visao[posicao:fim_linha]
+                try:
+                    valores[indice] = Compilador(texto, **opcoes).resultado
+                except Exception:
+                    valores[indice] = np.nan
+                    bits |= 1 << (indice % 8)
+                    erros += 1
+                finally:
+                    # Sem visões vivas, o mmap pode ser fechado
+                    texto.release()
+
+                if indice % 8 == 7:
+                    bitmap[indice // 8] = bits
+                    bits = 0
+                indice += 1
+                posicao = proxima
+            if indice % 8:
+                bitmap[indice // 8] = bits
+        finally:
+            visao.release()
+    valores.flush()
+    bitmap.flush()
+    return erros
+
+
+def avaliar_arquivo(caminho, saida_valores, saida_erros, workers=None, tamanho_shard=1 << 25,
+                    **opcoes):
+    """Avalia cada linha de `caminho`, gravando valores e bitmap de erros em .npy.
+
+    O bit `i % 8` do byte `i // 8` do bitmap marca erro na linha `i` (ver
+    erros_por_linha); linhas em branco também contam como erro. `opcoes` vão
+    para o Compilador; o lexer é sempre o rápido, o único que lê bytes, e o
+    padrão é o analisador por precedência e o avaliador sobre a árvore, que
+    não gera código para uma única avaliação. Devolve um resumo com o total
+    de linhas, de erros e de faixas.
+    """
+    opcoes = {'analisador': 'precedencia', 'avaliador': 'arvore', **opcoes, 'lexico': 'rapido'}
+    workers = workers or os.cpu_count() or 1
+    # Algumas faixas por processo, para que um processo lento não segure o fim
+    tamanho = os.path.getsize(caminho)
+    tamanho_shard = max(min(tamanho_shard, -(-tamanho // (4 * workers))), 1)
+
+    if tamanho:
+        with open(caminho, 'rb') as arquivo, \
+                mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            faixas, linhas = dividir(mapa, tamanho_shard)
+    else:
+        # mmap não aceita arquivos vazios
+        faixas, linhas = [], 0
+
+    valores = np.lib.format.open_memmap(saida_valores, mode='w+', dtype=np.float64, shape=(linhas,))
+    bitmap = np.lib.format.open_memmap(saida_erros, mode='w+', dtype=np.uint8, shape=(-(-linhas // 8),))
+    del valores, bitmap
+
+    argumentos = [(caminho, inicio, fim, primeira, saida_valores, saida_erros, opcoes)
+                  for inicio, fim, primeira in faixas]
+    if workers == 1:
+        erros = sum(_avaliar_faixa(*args) for args in argumentos)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            erros = sum(executor.map(_avaliar_faixa, *zip(*argumentos))) if argumentos else 0
+    return {'linhas': linhas, 'erros': erros, 'faixas': len(faixas)}
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Avalia um arquivo com uma expressão por linha")
+    parser.add_argument('entrada')
+    parser.add_argument('valores', help="arquivo .npy de saída com os valores (float64)")
+    parser.add_argument('erros', help="arquivo .npy de saída com o bitmap de erros")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--tamanho-shard', type=int, default=1 << 25, help="bytes por faixa")
+    parser.add_argument('--avaliador', choices=('vm', 'python', 'arvore'), default='arvore')
+    parser.add_argument('--dobrar', action='store_true',
+                        help="dobra as subexpressões constantes já na análise sintática")
+    args = parser.parse_args(argumentos)
+    resumo = avaliar_arquivo(args.entrada, args.valores, args.erros, args.workers,
+                             args.tamanho_shard, avaliador=args.avaliador, dobrar=args.dobrar)
+    print(f"{resumo['linhas']} linhas, {resumo['erros']} erros, {resumo['faixas']} faixas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
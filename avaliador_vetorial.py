@@ -0,0 +1,104 @@
+import numpy as np
+
+from geracao_codigo.alocador_registradores import AlocadorRegistradores, analisar_vivacidade
+from interpretador import valor_variavel
+
+ERRO_DIVISAO = "Erro: Divisão por zero"
+
+UFUNCS = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide}
+
+
+class AvaliadorVetorial:
+    """Avalia o TAC otimizado sobre colunas NumPy, uma instrução por vez.
+
+    As variáveis recebem arrays (ou escalares) e cada instrução vira uma
+    operação elemento a elemento, escrita com `out=` num buffer float64. Os
+    buffers são os "registradores" de uma alocação por varredura linear com
+    tantos registradores quanto a pressão máxima do TAC: temporários que
+    não vivem ao mesmo tempo dividem o mesmo buffer, e os buffers são
+    reaproveitados entre chamadas com o mesmo formato. Os cálculos são em
+    float64, então inteiros grandes perdem a exatidão que têm na avaliação
+    escalar.
+
+    Com `mascara=True`, divisões por zero não levantam erro: as linhas
+    afetadas ficam NaN e voltam marcadas numa máscara booleana.
+    """
+
+    def __init__(self, instrucoes, saida=None):
+        self.instrucoes = instrucoes
+        self.saida = saida
+        temporarios = {instr.resultado for instr in instrucoes}
+        self.variaveis = []
+        for instr in instrucoes:
+            for arg in (instr.arg1, instr.arg2):
+                if isinstance(arg, str) and arg not in temporarios and arg not in self.variaveis:
+                    self.variaveis.append(arg)
+        if not instrucoes and isinstance(saida, str):
+            self.variaveis.append(saida)
+
+        intervalos = analisar_vivacidade(instrucoes)
+        alocador = AlocadorRegistradores(instrucoes)
+        num_buffers = max(alocador.pressao_maxima(intervalos), 1)
+        alocador.registradores = tuple(f"B{i}" for i in range(num_buffers))
+        self.alocacao = alocador.alocar()
+        # Com registradores suficientes não há spill, mas posições M<n> também viram buffers
+        self.locais = sorted(set(self.alocacao.values()))
+        self._formato = None
+        self._buffers = None
+        self._erros = None
+
+    def preparar(self, formato):
+        if formato != self._formato:
+            self._buffers = {local: np.empty(formato, dtype=np.float64) for local in self.locais}
+            self._erros = np.empty(formato, dtype=bool)
+            self._formato = formato
+        return self._buffers
+
+    def avaliar(self, colunas, mascara=False):
+        valores = {nome: np.asarray(valor_variavel(colunas, nome), dtype=np.float64)
+                   for nome in self.variaveis}
+        # O formato vem de todas as colunas dadas, para que uma expressão
+        # constante também produza uma linha por linha da entrada
+        formato = np.broadcast_shapes(*(np.shape(coluna) for coluna in (colunas or {}).values()))
+        buffers = self.preparar(formato)
+        erros = self._erros
+        erros.fill(False)
+
+        def operando(arg):
+            if isinstance(arg, str):
+                if arg in valores:
+                    return valores[arg]
+                return buffers[self.alocacao[arg]]
+            return float(arg)
+
+        if not self.instrucoes:
+            resultado = np.broadcast_to(operando(self.saida), formato).astype(np.float64)
+            return (resultado, erros.copy()) if mascara else resultado
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            for instr in self.instrucoes:
+                destino = buffers[self.alocacao[instr.resultado]]
+                arg1 = operando(instr.arg1)
+                if instr.arg2 is None:
+                    np.copyto(destino, arg1)
+                    continue
+                arg2 = operando(instr.arg2)
+                if instr.op == '/':
+                    zeros = np.equal(arg2, 0)
+                    if zeros.any():
+                        if not mascara:
+                            raise Exception(ERRO_DIVISAO)
+                        np.logical_or(erros, zeros, out=erros)
+                    np.divide(arg1, arg2, out=destino)
+                elif instr.op == '<<':
+                    # Só é gerado para inteiros: x << k vale x * 2**k
+                    np.ldexp(arg1, int(instr.arg2), out=destino)
+                else:
+                    UFUNCS[instr.op](arg1, arg2, out=destino)
+
+        # Cópia: os buffers serão sobrescritos na próxima chamada
+        resultado = destino.copy()
+        if not mascara:
+            return resultado
+        resultado[erros] = np.nan
+        return resultado, erros.copy()
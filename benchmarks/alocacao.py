@@ -0,0 +1,43 @@
+"""Temporários, pressão de registradores e spills da alocação linear.
+
+Usa o TAC sem otimização, já que expressões só de literais são dobradas
+por completo pelo Otimizador.
+
+Uso: python -m benchmarks.alocacao [operadores]
+"""
+import random
+import sys
+import time
+
+from geracao_codigo.alocador_registradores import AlocadorRegistradores
+from geracao_codigo.gerador_tac import GeradorTAC
+from sintatico.registro import RegistroAnalisadores
+
+
+def gerar_expressao(operadores, semente=7):
+    gerador = random.Random(semente)
+    pilha = [str(gerador.randint(1, 9)) for _ in range(operadores + 1)]
+    # Combina operandos aleatórios até sobrar um: árvore de formato variado
+    while len(pilha) > 1:
+        i = gerador.randrange(len(pilha) - 1)
+        pilha[i:i + 2] = [f"({pilha[i]} {gerador.choice('+-*/')} {pilha[i + 1]})"]
+    return pilha[0]
+
+
+def main():
+    operadores = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    registro = RegistroAnalisadores()
+    arvore = registro.analisador('precedencia', 'rapido').analisar(gerar_expressao(operadores))
+    gerador = GeradorTAC()
+    gerador.visitar(arvore)
+
+    for quantidade in (2, 4, 8, 16):
+        alocador = AlocadorRegistradores(gerador.instrucoes, [f"R{i}" for i in range(quantidade)])
+        inicio = time.perf_counter()
+        alocador.alocar()
+        tempo = time.perf_counter() - inicio
+        print(f"{quantidade:3} registradores: {alocador.relatorio} ({tempo * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
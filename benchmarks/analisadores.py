@@ -0,0 +1,61 @@
+"""Vazão do analisador LALR (PLY) contra o analisador por precedência.
+
+Uso: python -m benchmarks.analisadores [repeticoes]
+"""
+import sys
+import time
+
+from sintatico.registro import RegistroAnalisadores
+
+
+def expressao_rasa():
+    return "3 + 5 * 2 - 100 / (2 + 3)"
+
+
+def expressao_profunda(profundidade=400):
+    return "(" * profundidade + "1" + " + 2)" * profundidade
+
+
+def expressao_larga(termos=5000):
+    operadores = "+-*/"
+    partes = ["1"]
+    for i in range(1, termos):
+        partes.append(operadores[i % 4])
+        partes.append(str(i % 9 + 1))
+    return " ".join(partes)
+
+
+CASOS = [
+    ("rasa", expressao_rasa()),
+    ("profunda", expressao_profunda()),
+    ("larga", expressao_larga()),
+]
+
+
+def medir(analisador, texto, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        analisador.analisar(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    registro = RegistroAnalisadores()
+
+    print(f"{'caso':10} {'tokens':>8} {'ply tok/s':>14} {'precedência tok/s':>18} {'ganho':>7}")
+    for nome, texto in CASOS:
+        ply = registro.analisador('ply')
+        precedencia = registro.analisador('precedencia')
+        num_tokens = len(ply.analisador_lexico.tokenizar(texto))
+
+        tempo_ply = medir(ply, texto, repeticoes)
+        tempo_precedencia = medir(precedencia, texto, repeticoes)
+        print(f"{nome:10} {num_tokens:8} {num_tokens / tempo_ply:14.0f} "
+              f"{num_tokens / tempo_precedencia:18.0f} {tempo_ply / tempo_precedencia:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Avaliação de um arquivo grande: CLI linha a linha contra avaliar_arquivo.
+
+Gera um arquivo com o corpus sintético e mede a vazão do cli.processar
+(str por linha) e do avaliar_arquivo (mmap, bytes) com 1 e N processos,
+além do pico de memória alocada no processo principal pelo avaliar_arquivo,
+que não deve crescer com o número de linhas.
+
+Uso: python -m benchmarks.arquivo [linhas]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from avaliacao_arquivo import avaliar_arquivo
+from benchmarks.gerador_expressoes import GeradorExpressoes
+from cli import ler_linhas, processar
+
+
+def pico_memoria(funcao, *args):
+    tracemalloc.start()
+    try:
+        funcao(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def escrever(caminho, linhas):
+    with open(caminho, 'w') as arquivo:
+        for expressao in GeradorExpressoes(semente=0).corpus(linhas):
+            arquivo.write(expressao + "\n")
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nucleos = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as diretorio:
+        entrada = os.path.join(diretorio, 'entrada.txt')
+        valores = os.path.join(diretorio, 'valores.npy')
+        erros = os.path.join(diretorio, 'erros.npy')
+        escrever(entrada, linhas)
+        print(f"{linhas} linhas, {os.path.getsize(entrada) / 2 ** 20:.1f} MiB")
+
+        inicio = time.perf_counter()
+        for _ in processar(ler_linhas([entrada]), avaliador='arvore'):
+            pass
+        print(f"  cli.processar        {linhas / (time.perf_counter() - inicio):10.0f} linhas/s")
+
+        for workers in sorted({1, nucleos}):
+            inicio = time.perf_counter()
+            resumo = avaliar_arquivo(entrada, valores, erros, workers)
+            vazao = linhas / (time.perf_counter() - inicio)
+            print(f"  avaliar_arquivo ({workers:2})  {vazao:10.0f} linhas/s  "
+                  f"({resumo['faixas']} faixas, {resumo['erros']} erros)")
+
+        for quantidade in (linhas // 10, linhas):
+            escrever(entrada, quantidade)
+            pico = pico_memoria(avaliar_arquivo, entrada, valores, erros, 1)
+            print(f"  pico com {quantidade:8} linhas: {pico / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
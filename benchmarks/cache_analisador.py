@@ -0,0 +1,50 @@
+"""Latência de Compilador.compilar() com e sem o registro de analisadores.
+
+Uso: python -m benchmarks.cache_analisador [repeticoes]
+"""
+import sys
+import time
+
+from compilador import Compilador
+from sintatico.analisador_sintatico import AnalisadorSintatico
+from sintatico.registro import RegistroAnalisadores
+
+EXPRESSAO = "(10 + 5) * 3 - 100 / (2 + 3)"
+
+
+class _RegistroFrio:
+    """Reconstrói lexer e parser a cada chamada, como antes do registro."""
+
+    def analisador(self, tipo='ply', lexico='ply', fabrica=None):
+        return AnalisadorSintatico(fabrica=fabrica)
+
+
+def medir(registro, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        Compilador(EXPRESSAO, registro).compilar()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    registro = RegistroAnalisadores()
+
+    inicio = time.perf_counter()
+    Compilador(EXPRESSAO, registro).compilar()
+    primeira = time.perf_counter() - inicio
+
+    frio = medir(_RegistroFrio(), repeticoes)
+    quente = medir(registro, repeticoes)
+
+    print(f"primeira chamada (constrói tabelas): {primeira * 1e6:10.1f} us")
+    print(f"mediana sem registro (frio):         {frio * 1e6:10.1f} us")
+    print(f"mediana com registro (quente):       {quente * 1e6:10.1f} us")
+    print(f"aceleração:                          {frio / quente:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Tráfego repetitivo com e sem o CacheCompilacao.
+
+Sorteia expressões de um conjunto pequeno, variando só os espaços, e mede a
+vazão de Compilador.compilar() direto contra a do cache, com várias threads.
+
+Uso: python -m benchmarks.cache_compilacao [requisicoes] [threads]
+"""
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_compilacao import CacheCompilacao
+from compilador import Compilador
+
+EXPRESSOES = [
+    "(10 + 5) * 3 - 100 / (2 + 3)",
+    "1 + 2 * 3",
+    "((4 - 2) * (8 / 4)) + 7",
+    "2.5 * (3 + 4.5) / 0.5",
+    "100 - 99 - 98 - 97",
+]
+
+
+def variantes(requisicoes, semente=0):
+    gerador = random.Random(semente)
+    saida = []
+    for _ in range(requisicoes):
+        expressao = gerador.choice(EXPRESSOES)
+        if gerador.random() < 0.5:
+            expressao = expressao.replace(" ", "")
+        saida.append(" " * gerador.randint(0, 2) + expressao)
+    return saida
+
+
+def medir(funcao, entradas, threads):
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(funcao, entradas))
+    return len(entradas) / (time.perf_counter() - inicio)
+
+
+def main():
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    entradas = variantes(requisicoes)
+    cache = CacheCompilacao(tamanho_maximo=64)
+
+    sem_cache = medir(lambda e: Compilador(e).compilar(), entradas, threads)
+    com_cache = medir(cache.avaliar, entradas, threads)
+    print(f"sem cache  {sem_cache:12.0f} expr/s")
+    print(f"com cache  {com_cache:12.0f} expr/s  ({com_cache / sem_cache:.1f}x)")
+    print(f"cache      {cache.estatisticas()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Dobramento de constantes na análise sintática: tamanho da AST e vazão.
+
+Compara o Compilador com e sem `dobrar=True` sobre o corpus sintético (só
+constantes) e sobre o mesmo corpus com parte dos literais trocada por
+variáveis, medindo os nós da AST e a vazão de compilar() por analisador.
+
+Uso: python -m benchmarks.dobramento [quantidade]
+"""
+import gc
+import random
+import re
+import sys
+import time
+
+from benchmarks.gerador_expressoes import GeradorExpressoes
+from compilador import Compilador
+from sintatico.visitante import percorrer
+
+VALORES = {'x': 3, 'y': 0.5}
+
+
+def com_variaveis(textos, proporcao=0.2, semente=0):
+    """Troca cerca de `proporcao` dos literais por x ou y"""
+    sorteio = random.Random(semente)
+    trocar = lambda m: sorteio.choice('xy') if sorteio.random() < proporcao else m.group()
+    return [re.sub(r'\d+(\.\d+)?', trocar, texto) for texto in textos]
+
+
+def medir(textos, repeticoes=3, **opcoes):
+    nos = 0
+    for texto in textos:
+        try:
+            nos += sum(1 for _ in percorrer(Compilador(texto, **opcoes).ast))
+        except Exception:
+            pass
+
+    gc.collect()
+    gc.disable()
+    try:
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            for texto in textos:
+                try:
+                    Compilador(texto, valores=VALORES, **opcoes).compilar()
+                except Exception:
+                    pass
+            melhor = min(melhor, time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return nos, len(textos) / melhor
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    constantes = GeradorExpressoes(semente=0).corpus(quantidade)
+    corpora = (('constantes', constantes), ('com variáveis', com_variaveis(constantes)))
+    Compilador("1 + 1").compilar()
+
+    for nome, textos in corpora:
+        print(f"{nome}: {quantidade} expressões")
+        for analisador, lexico in (('ply', 'ply'), ('precedencia', 'rapido')):
+            nos, vazao = medir(textos, analisador=analisador, lexico=lexico)
+            nos_dobrado, vazao_dobrado = medir(textos, analisador=analisador, lexico=lexico, dobrar=True)
+            print(f"  {analisador:12} nós {nos:8} -> {nos_dobrado:8}   "
+                  f"compilar {vazao:8.0f} -> {vazao_dobrado:8.0f} expr/s ({vazao_dobrado / vazao:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Gerador reprodutível de expressões válidas para os benchmarks.
+
+Uma expressão de profundidade d é uma cadeia de `largura` termos ligados
+por operadores sorteados segundo `operadores` (operador -> peso). Cada
+termo é um literal ou, com d > 0, uma subexpressão de profundidade d - 1,
+entre parênteses com probabilidade `parenteses` (sem eles, ela se mistura
+com a cadeia de fora pela precedência). Literais são sempre não nulos,
+para que nenhuma divisão por literal zero seja rejeitada pela análise
+semântica; uma subexpressão ainda pode valer zero e falhar na execução.
+
+Uso: python -m benchmarks.gerador_expressoes [quantidade] [semente]
+"""
+import random
+import sys
+
+
+class GeradorExpressoes:
+    def __init__(self, semente=0, profundidade=3, largura=3, operadores=None,
+                 proporcao_float=0.25, parenteses=0.8, prob_subexpressao=0.5):
+        self.aleatorio = random.Random(semente)
+        self.profundidade = profundidade
+        self.largura = largura
+        self.operadores = operadores or {'+': 1, '-': 1, '*': 1, '/': 1}
+        self.proporcao_float = proporcao_float
+        self.parenteses = parenteses
+        self.prob_subexpressao = prob_subexpressao
+        self._simbolos = list(self.operadores)
+        self._pesos = list(self.operadores.values())
+
+    def configuracao(self):
+        return {
+            'profundidade': self.profundidade,
+            'largura': self.largura,
+            'operadores': dict(self.operadores),
+            'proporcao_float': self.proporcao_float,
+            'parenteses': self.parenteses,
+            'prob_subexpressao': self.prob_subexpressao,
+        }
+
+    def literal(self):
+        if self.aleatorio.random() < self.proporcao_float:
+            return f"{self.aleatorio.randint(1, 999) / 10:.1f}"
+        return str(self.aleatorio.randint(1, 99))
+
+    def termo(self, profundidade):
+        if profundidade > 0 and self.aleatorio.random() < self.prob_subexpressao:
+            sub = self.expressao(profundidade - 1)
+            if self.aleatorio.random() < self.parenteses:
+                return f"({sub})"
+            return sub
+        return self.literal()
+
+    def expressao(self, profundidade=None):
+        if profundidade is None:
+            profundidade = self.profundidade
+        partes = [self.termo(profundidade)]
+        for _ in range(self.largura - 1):
+            partes.append(self.aleatorio.choices(self._simbolos, self._pesos)[0])
+            partes.append(self.termo(profundidade))
+        return " ".join(partes)
+
+    def corpus(self, quantidade):
+        return [self.expressao() for _ in range(quantidade)]
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    semente = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    for expressao in GeradorExpressoes(semente).corpus(quantidade):
+        print(expressao)
+
+
+if __name__ == "__main__":
+    main()
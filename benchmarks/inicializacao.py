@@ -0,0 +1,57 @@
+"""Tempo de inicialização de um processo sem interface gráfica.
+
+Mede, em processos novos, o import de `compilador` e a primeira compilação
+com tabelas construídas na hora e com tabelas lidas do disco. Também
+confere que nenhum desses caminhos carrega o tkinter.
+
+Uso: python -m benchmarks.inicializacao [repeticoes]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SO_IMPORT = "import compilador, main"
+PRIMEIRA_COMPILACAO = (
+    "import sys, compilador, main\n"
+    "compilador.Compilador('(10 + 5) * 3').compilar()\n"
+    "assert 'tkinter' not in sys.modules\n"
+)
+
+
+def medir(codigo, repeticoes, ambiente=None):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, env=ambiente, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    ambiente = dict(os.environ)
+    ambiente.pop('COMPILADOR_TABELAS', None)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        com_tabelas = dict(ambiente, COMPILADOR_TABELAS=diretorio)
+        # Gera as tabelas uma vez antes de medir
+        subprocess.run([sys.executable, "-m", "sintatico.registro", diretorio], cwd=RAIZ, check=True)
+
+        resultados = [
+            ("interpretador vazio", medir("pass", repeticoes, ambiente)),
+            ("import compilador, main", medir(SO_IMPORT, repeticoes, ambiente)),
+            ("1a compilação, tabelas construídas", medir(PRIMEIRA_COMPILACAO, repeticoes, ambiente)),
+            ("1a compilação, tabelas em disco", medir(PRIMEIRA_COMPILACAO, repeticoes, com_tabelas)),
+        ]
+
+    for nome, tempo in resultados:
+        print(f"{nome:38} {tempo * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
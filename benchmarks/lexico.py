@@ -0,0 +1,46 @@
+"""Vazão e memória do lexer do PLY contra o AnalisadorLexicoRapido.
+
+Uso: python -m benchmarks.lexico [termos]
+"""
+import sys
+import time
+import tracemalloc
+
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.analisador_lexico_rapido import AnalisadorLexicoRapido
+
+
+def gerar_texto(termos):
+    operadores = "+-*/"
+    partes = ["(1.5"]
+    for i in range(1, termos):
+        partes.append(operadores[i % 4])
+        partes.append(str(i))
+    partes.append(")")
+    return " ".join(partes)
+
+
+def medir(lexico, texto):
+    inicio = time.perf_counter()
+    tokens = lexico.tokenizar(texto)
+    tempo = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    tokens = lexico.tokenizar(texto)
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(tokens), tempo, memoria
+
+
+def main():
+    termos = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    texto = gerar_texto(termos)
+
+    for nome, lexico in [("ply", AnalisadorLexico()), ("rapido", AnalisadorLexicoRapido())]:
+        num_tokens, tempo, memoria = medir(lexico, texto)
+        print(f"{nome:7} {num_tokens:9} tokens {num_tokens / tempo:12.0f} tok/s "
+              f"{memoria / num_tokens:8.1f} bytes/token")
+
+
+if __name__ == "__main__":
+    main()
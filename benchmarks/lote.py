@@ -0,0 +1,31 @@
+"""Vazão de compilar_lote conforme o número de processos.
+
+Uso: python -m benchmarks.lote [quantidade] [chunk_size]
+"""
+import os
+import sys
+import time
+
+from benchmarks.gerador_expressoes import GeradorExpressoes
+from lote import compilar_lote
+
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+    expressoes = GeradorExpressoes(semente=0).corpus(quantidade)
+    nucleos = os.cpu_count() or 1
+
+    base = None
+    workers = 1
+    while workers <= nucleos:
+        inicio = time.perf_counter()
+        erros = sum(item.erro is not None for item in compilar_lote(expressoes, workers, chunk_size))
+        vazao = quantidade / (time.perf_counter() - inicio)
+        base = base or vazao
+        print(f"{workers:3} processos  {vazao:10.0f} expr/s  {vazao / base:5.2f}x  ({erros} erros)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
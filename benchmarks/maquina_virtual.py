@@ -0,0 +1,56 @@
+"""Avaliação repetida: máquina virtual e função Python contra o Interpretador.
+
+Como hoje todos os operandos são literais, o Otimizador reduz qualquer
+expressão a uma constante; para medir o laço da VM, o bytecode aqui é
+gerado a partir do TAC sem otimização, com o mesmo número de operações que
+o Interpretador avalia na árvore. O tempo de compile() da função Python
+não entra na medida, já que ela é compilada uma vez e reaproveitada.
+
+Uso: python -m benchmarks.maquina_virtual [niveis]
+"""
+import sys
+import time
+
+from benchmarks.visitantes import arvore_balanceada
+from geracao_codigo.bytecode import GeradorBytecode
+from geracao_codigo.gerador_python import GeradorPython
+from geracao_codigo.gerador_tac import GeradorTAC
+from interpretador import Interpretador
+from maquina_virtual import MaquinaVirtual
+
+
+def medir(funcao, repeticoes=5):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    niveis = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    arvore = arvore_balanceada(niveis)
+    num_nos = 2 ** (niveis + 1) - 1
+
+    gerador = GeradorTAC()
+    saida = gerador.visitar(arvore)
+    programa = GeradorBytecode(gerador.instrucoes, saida).gerar()
+    funcao = GeradorPython(gerador.instrucoes, saida).compilar()
+    vm = MaquinaVirtual()
+    interpretador = Interpretador()
+    assert vm.executar(programa) == interpretador.visitar(arvore) == funcao()
+
+    tempo_arvore = medir(lambda: interpretador.visitar(arvore))
+    tempo_vm = medir(lambda: vm.executar(programa))
+    tempo_python = medir(funcao)
+    print(f"árvore balanceada, {num_nos} nós, {len(programa)} instruções de bytecode")
+    print(f"  interpretador (AST)  {tempo_arvore / num_nos * 1e9:8.1f} ns/nó")
+    print(f"  máquina virtual      {tempo_vm / num_nos * 1e9:8.1f} ns/nó")
+    print(f"  função Python        {tempo_python / num_nos * 1e9:8.1f} ns/nó")
+    print(f"  aceleração VM        {tempo_arvore / tempo_vm:8.2f}x")
+    print(f"  aceleração Python    {tempo_arvore / tempo_python:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
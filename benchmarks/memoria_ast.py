@@ -0,0 +1,77 @@
+"""Memória por nó da AST: classes com __dict__, classes com __slots__ e arena.
+
+Uso: python -m benchmarks.memoria_ast [termos]
+"""
+import random
+import sys
+import tracemalloc
+
+from lexico.analisador_lexico_rapido import AnalisadorLexicoRapido
+from sintatico.analisador_precedencia import AnalisadorPrecedencia
+from sintatico.arena import ArenaAST
+from sintatico.nos_ast import FabricaNos
+
+
+class _NumeroComDict:
+    def __init__(self, valor):
+        self.valor = valor
+
+
+class _VariavelComDict:
+    def __init__(self, nome):
+        self.nome = nome
+
+
+class _OperacaoComDict:
+    def __init__(self, op, esquerda, direita):
+        self.op = op
+        self.esquerda = esquerda
+        self.direita = direita
+
+
+class FabricaComDict:
+    """Referência: nós sem __slots__, como antes"""
+
+    def numero(self, valor, posicao=None):
+        return _NumeroComDict(valor)
+
+    def variavel(self, nome, posicao=None):
+        return _VariavelComDict(nome)
+
+    def operacao(self, op, esquerda, direita, posicao=None):
+        return _OperacaoComDict(op, esquerda, direita)
+
+
+def gerar_corpus(termos, semente=42):
+    gerador = random.Random(semente)
+    partes = [str(gerador.randint(0, 999))]
+    for _ in range(termos - 1):
+        partes.append(gerador.choice("+-*/"))
+        valor = gerador.randint(1, 999)
+        partes.append(str(valor) if gerador.random() < 0.7 else f"{valor}.5")
+    return " ".join(partes)
+
+
+def medir(fabrica, texto):
+    analisador = AnalisadorPrecedencia(analisador_lexico=AnalisadorLexicoRapido(), fabrica=fabrica)
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    raiz = analisador.analisar(texto)
+    analisador.analisador_lexico.fluxo = None
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return raiz, depois - antes
+
+
+def main():
+    termos = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    texto = gerar_corpus(termos)
+    num_nos = 2 * termos - 1
+
+    for nome, fabrica in [("__dict__", FabricaComDict()), ("__slots__", FabricaNos()), ("arena", ArenaAST())]:
+        _, memoria = medir(fabrica, texto)
+        print(f"{nome:10} {num_nos:9} nós {memoria / num_nos:8.1f} bytes/nó")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Latência e vazão do ServidorAvaliacao com clientes concorrentes em localhost.
+
+Uso: python -m benchmarks.servidor [clientes] [expressoes_por_cliente]
+"""
+import asyncio
+import sys
+import time
+
+from benchmarks.gerador_expressoes import GeradorExpressoes
+from servidor import ServidorAvaliacao, consultar
+
+
+async def executar(clientes, por_cliente):
+    servidor = ServidorAvaliacao()
+    await servidor.iniciar(porta=0)
+    host, porta = servidor.endereco
+    corpus = [GeradorExpressoes(semente=i, profundidade=2).corpus(por_cliente) for i in range(clientes)]
+
+    inicio = time.perf_counter()
+    respostas = await asyncio.gather(*(consultar(expressoes, host, porta) for expressoes in corpus))
+    duracao = time.perf_counter() - inicio
+    await servidor.fechar()
+
+    total = clientes * por_cliente
+    assert sum(len(r) for r in respostas) == total
+    estatisticas = servidor.estatisticas()
+    latencia = estatisticas['latencia']
+    print(f"{clientes} clientes x {por_cliente} expressões: {total / duracao:.0f} expr/s")
+    print(f"  {estatisticas['lotes']} lotes ({total / estatisticas['lotes']:.1f} expressões/lote), "
+          f"{estatisticas['erros']} erros")
+    print(f"  latência: média {latencia['media'] * 1000:.2f} ms, p50 <= {latencia['p50'] * 1000:g} ms, "
+          f"p99 <= {latencia['p99'] * 1000:g} ms")
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    por_cliente = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(executar(clientes, por_cliente))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Suíte de benchmarks por etapa sobre um corpus sintético reprodutível.
+
+Gera o corpus com o GeradorExpressoes e roda cada etapa do compilador
+isoladamente sobre ele, com as entradas já produzidas pela etapa anterior.
+Para cada etapa, registra a vazão (expressões/s, melhor de N repetições),
+o pico de memória durante a etapa e a memória retida pelas suas saídas
+(medidas numa passada separada, com tracemalloc). O resultado vai para um
+JSON; `--comparar` mostra a variação entre dois desses arquivos e termina
+com código 1 se alguma etapa piorou além do limite.
+
+Uso: python -m benchmarks.suite [--quantidade N] [--semente S] [--saida arq.json]
+     python -m benchmarks.suite --comparar antes.json depois.json [--limite 10]
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.gerador_expressoes import GeradorExpressoes
+from geracao_codigo.gerador_assembly import GeradorCodigo
+from geracao_codigo.gerador_tac import GeradorTAC
+from geracao_codigo.otimizador import Otimizador
+from interpretador import Interpretador
+from passe_fundido import PasseFundido
+from lexico.analisador_lexico import AnalisadorLexico
+from semantico.analisador_semantico import AnalisadorSemantico
+from sintatico.registro import registro_global
+
+
+def lexico(textos):
+    analisador = AnalisadorLexico(registro_global.obter_lexer())
+    return [list(analisador.tokenizar(texto)) for texto in textos]
+
+
+def sintatico(textos):
+    return [registro_global.analisador().analisar(texto) for texto in textos]
+
+
+def semantico(arvores):
+    return [AnalisadorSemantico().visitar(arvore) for arvore in arvores]
+
+
+def tac(arvores):
+    listas = []
+    for arvore in arvores:
+        gerador = GeradorTAC()
+        gerador.visitar(arvore)
+        listas.append(gerador.instrucoes)
+    return listas
+
+
+def otimizacao(listas_tac):
+    return [Otimizador(instrucoes).otimizar() for instrucoes in listas_tac]
+
+
+def assembly(listas_tac):
+    return [GeradorCodigo(instrucoes).gerar() for instrucoes in listas_tac]
+
+
+def interpretacao(arvores):
+    resultados = []
+    for arvore in arvores:
+        try:
+            resultados.append(Interpretador().visitar(arvore))
+        except Exception as e:
+            resultados.append(e)
+    return resultados
+
+
+def passe_fundido(arvores):
+    saidas = []
+    for arvore in arvores:
+        passe = PasseFundido()
+        try:
+            saidas.append(passe.visitar(arvore))
+        except Exception as e:
+            saidas.append(e)
+    return saidas
+
+
+# (nome, função, nome da entrada); a entrada 'textos' é o próprio corpus
+ETAPAS = [
+    ('lexico', lexico, 'textos'),
+    ('sintatico', sintatico, 'textos'),
+    ('semantico', semantico, 'sintatico'),
+    ('tac', tac, 'sintatico'),
+    ('otimizacao', otimizacao, 'tac'),
+    ('assembly', assembly, 'otimizacao'),
+    ('interpretacao', interpretacao, 'sintatico'),
+    # As três travessias acima (semântica, TAC, interpretação) numa só
+    ('passe_fundido', passe_fundido, 'sintatico'),
+]
+
+
+def medir_tempo(funcao, entrada, repeticoes):
+    # Sem o coletor cíclico, que de outra forma dispara em momentos diferentes a cada rodada
+    gc.collect()
+    gc.disable()
+    try:
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            saida = funcao(entrada)
+            melhor = min(melhor, time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return melhor, saida
+
+
+def medir_memoria(funcao, entrada):
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        saida = funcao(entrada)
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del saida
+    return pico - antes, atual - antes
+
+
+def executar(quantidade, semente, repeticoes, **opcoes_gerador):
+    gerador = GeradorExpressoes(semente, **opcoes_gerador)
+    textos = gerador.corpus(quantidade)
+    # Constrói as tabelas do PLY fora das medições
+    registro_global.analisador().analisar("1 + 1")
+
+    saidas = {'textos': textos}
+    etapas = {}
+    for nome, funcao, nome_entrada in ETAPAS:
+        entrada = saidas[nome_entrada]
+        tempo, saidas[nome] = medir_tempo(funcao, entrada, repeticoes)
+        pico, retida = medir_memoria(funcao, entrada)
+        etapas[nome] = {
+            'tempo': tempo,
+            'expressoes_por_s': len(entrada) / tempo,
+            'memoria_pico': pico,
+            'memoria_retida': retida,
+        }
+
+    erros = sum(isinstance(r, Exception) for r in saidas['interpretacao'])
+    return {
+        'corpus': {
+            'quantidade': quantidade,
+            'semente': semente,
+            'caracteres': sum(len(t) for t in textos),
+            'tokens': sum(len(t) for t in saidas['lexico']),
+            'instrucoes_tac': sum(len(t) for t in saidas['tac']),
+            'erros_execucao': erros,
+            'gerador': gerador.configuracao(),
+        },
+        'ambiente': {
+            'python': platform.python_version(),
+            'implementacao': platform.python_implementation(),
+            'plataforma': platform.platform(),
+        },
+        'repeticoes': repeticoes,
+        'etapas': etapas,
+    }
+
+
+def imprimir(resultado):
+    corpus = resultado['corpus']
+    print(f"{corpus['quantidade']} expressões, {corpus['tokens']} tokens, "
+          f"{corpus['instrucoes_tac']} instruções TAC (semente {corpus['semente']})")
+    print(f"{'etapa':14} {'expr/s':>12} {'pico (KiB)':>12} {'retida (KiB)':>13}")
+    for nome, dados in resultado['etapas'].items():
+        print(f"{nome:14} {dados['expressoes_por_s']:12.0f} {dados['memoria_pico'] / 1024:12.1f} "
+              f"{dados['memoria_retida'] / 1024:13.1f}")
+
+
+def comparar(antes, depois, limite):
+    """Imprime a variação por etapa; devolve as etapas que pioraram além de `limite`%"""
+    if antes['corpus'] != depois['corpus']:
+        print("aviso: os corpus diferem; a comparação pode não fazer sentido")
+    regressoes = []
+    print(f"{'etapa':14} {'vazão':>9} {'pico':>9} {'retida':>9}")
+    for nome, dados in depois['etapas'].items():
+        anterior = antes['etapas'].get(nome)
+        if anterior is None:
+            print(f"{nome:14} {'(nova)':>9}")
+            continue
+        variacoes = []
+        for chave, maior_e_melhor in (('expressoes_por_s', True), ('memoria_pico', False),
+                                      ('memoria_retida', False)):
+            base = anterior[chave]
+            variacao = (dados[chave] - base) / base * 100 if base else 0.0
+            piora = -variacao if maior_e_melhor else variacao
+            if piora > limite:
+                regressoes.append((nome, chave, variacao))
+            variacoes.append(variacao)
+        print(f"{nome:14} " + " ".join(f"{v:+8.1f}%" for v in variacoes))
+    for nome, chave, variacao in regressoes:
+        print(f"regressão: {nome} {chave} {variacao:+.1f}%")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa do compilador")
+    parser.add_argument('--quantidade', type=int, default=2000)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    parser.add_argument('--profundidade', type=int, default=3)
+    parser.add_argument('--largura', type=int, default=3)
+    parser.add_argument('--proporcao-float', type=float, default=0.25)
+    parser.add_argument('--parenteses', type=float, default=0.8)
+    parser.add_argument('--pesos', default='1,1,1,1',
+                        help="pesos de + - * /, separados por vírgula")
+    parser.add_argument('--saida', help="arquivo JSON para gravar o resultado")
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES', 'DEPOIS'))
+    parser.add_argument('--limite', type=float, default=10.0,
+                        help="piora percentual tolerada antes de acusar regressão")
+    args = parser.parse_args()
+
+    if args.comparar:
+        with open(args.comparar[0]) as f:
+            antes = json.load(f)
+        with open(args.comparar[1]) as f:
+            depois = json.load(f)
+        sys.exit(1 if comparar(antes, depois, args.limite) else 0)
+
+    pesos = [float(p) for p in args.pesos.split(',')]
+    resultado = executar(args.quantidade, args.semente, args.repeticoes,
+                         profundidade=args.profundidade, largura=args.largura,
+                         operadores=dict(zip('+-*/', pesos)),
+                         proporcao_float=args.proporcao_float, parenteses=args.parenteses)
+    imprimir(resultado)
+    if args.saida:
+        with open(args.saida, 'w') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Custo por nó dos passes sobre a AST.
+
+Compara o Visitante (pilha explícita, despacho por classe) com a forma
+anterior de visitar (recursão + getattr com nome montado a cada nó) numa
+árvore balanceada, e roda os passes numa cadeia de um milhão de nós, que a
+versão recursiva não consegue percorrer.
+
+Uso: python -m benchmarks.visitantes [niveis]
+"""
+import sys
+import time
+
+from geracao_codigo.gerador_tac import GeradorTAC
+from interpretador import Interpretador
+from semantico.analisador_semantico import AnalisadorSemantico
+from sintatico.nos_ast import NoNumero, NoOperacaoBinaria
+
+
+class InterpretadorRecursivo:
+    """Referência: o Interpretador como era antes do Visitante"""
+
+    def visitar(self, no):
+        nome_metodo = f'visitar_{type(no).__name__}'
+        visitador = getattr(self, nome_metodo)
+        return visitador(no)
+
+    def visitar_NoNumero(self, no):
+        return no.valor
+
+    def visitar_NoOperacaoBinaria(self, no):
+        esquerda = self.visitar(no.esquerda)
+        direita = self.visitar(no.direita)
+        if no.op == '+':
+            return esquerda + direita
+        elif no.op == '-':
+            return esquerda - direita
+        elif no.op == '*':
+            return esquerda * direita
+        elif no.op == '/':
+            if direita == 0:
+                raise Exception("Erro: Divisão por zero")
+            return esquerda / direita
+
+
+def arvore_balanceada(niveis):
+    if niveis == 0:
+        return NoNumero(niveis + 1)
+    return NoOperacaoBinaria('+*'[niveis % 2], arvore_balanceada(niveis - 1), arvore_balanceada(niveis - 1))
+
+
+def cadeia(tamanho):
+    no = NoNumero(1)
+    for _ in range(tamanho):
+        no = NoOperacaoBinaria('+', no, NoNumero(1))
+    return no
+
+
+def medir(passe, arvore, num_nos, repeticoes=5):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        passe.visitar(arvore)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor / num_nos * 1e9
+
+
+def main():
+    niveis = int(sys.argv[1]) if len(sys.argv) > 1 else 17
+    arvore = arvore_balanceada(niveis)
+    num_nos = 2 ** (niveis + 1) - 1
+
+    print(f"árvore balanceada, {num_nos} nós (ns/nó)")
+    print(f"  interpretador recursivo  {medir(InterpretadorRecursivo(), arvore, num_nos):8.1f}")
+    print(f"  interpretador visitante  {medir(Interpretador(), arvore, num_nos):8.1f}")
+
+    tamanho = 500000
+    arvore = cadeia(tamanho)
+    num_nos = 2 * tamanho + 1
+    print(f"cadeia esquerda, {num_nos} nós (ns/nó)")
+    for classe in (AnalisadorSemantico, GeradorTAC, Interpretador):
+        print(f"  {classe.__name__:24} {medir(classe(), arvore, num_nos, 1):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
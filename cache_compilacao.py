@@ -0,0 +1,132 @@
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+from compilador import Compilador
+from lexico.analisador_lexico import AnalisadorLexico
+from sintatico.visitante import percorrer
+
+# Só os espaços que o léxico ignora (não \r, \f ou NBSP, que ele recusa), e
+# só ao redor de operadores e parênteses: "1 2" continua sendo um erro, em
+# vez de virar o número 12
+_IGNORADOS = AnalisadorLexico.t_ignore
+_ESPACOS = re.compile(f"[{re.escape(_IGNORADOS)}]*([-+*/()])[{re.escape(_IGNORADOS)}]*")
+
+
+def normalizar(codigo_fonte: str) -> str:
+    return _ESPACOS.sub(r'\1', codigo_fonte).strip(_IGNORADOS)
+
+
+def _tamanho_lista(itens):
+    return sys.getsizeof(itens) + sum(sys.getsizeof(item) for item in itens)
+
+
+def estimar_memoria(compilador: Compilador) -> int:
+    """Estimativa (rasa) dos bytes ocupados pelos artefatos de uma compilação"""
+    total = sys.getsizeof(compilador.codigo_fonte) + sys.getsizeof(compilador.assembly)
+    for itens in (compilador.tokens, compilador.instrucoes_tac,
+                  compilador.instrucoes_otimizadas, compilador.instrucoes_assembly):
+        total += _tamanho_lista(itens)
+    if compilador.ast is not None:
+        total += sum(sys.getsizeof(no) for no in percorrer(compilador.ast))
+    return total
+
+
+class CacheCompilacao:
+    """Cache LRU de compilações, indexado pelo código-fonte normalizado.
+
+    Guarda o Compilador já compilado, com os artefatos de todas as etapas
+    até a geração de código; a avaliação fica para `.resultado`, então uma
+    expressão que compila mas falha ao executar (como `1/(1-1)`, ou uma
+    com variáveis) também é guardada. Quem recebe o Compilador não deve
+    alterá-lo. Ele é construído a partir do texto normalizado, então
+    `codigo_fonte` e as posições dos tokens referem-se a esse texto, não ao
+    original; as mensagens de erro de compilação, ao contrário, usam as
+    posições do original.
+
+    Os limites são de entradas (`tamanho_maximo`) e, opcionalmente, de
+    bytes estimados (`memoria_maxima`). Erros de compilação não são
+    guardados. Pode ser compartilhado entre threads; a compilação em si roda
+    fora da trava.
+    """
+
+    def __init__(self, tamanho_maximo=1024, memoria_maxima=None, **opcoes):
+        self.tamanho_maximo = tamanho_maximo
+        self.memoria_maxima = memoria_maxima
+        # Repassadas ao Compilador (analisador, avaliador, registradores...)
+        self.opcoes = opcoes
+        self._entradas = OrderedDict()
+        self._trava = threading.Lock()
+        self.memoria = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def compilar(self, codigo_fonte: str) -> Compilador:
+        chave = normalizar(codigo_fonte)
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return entrada[0]
+            self.falhas += 1
+
+        compilador = Compilador(chave, **self.opcoes)
+        try:
+            self._gerar_codigo(compilador)
+        except Exception:
+            # As posições nas mensagens de erro devem ser as do texto original
+            self._gerar_codigo(Compilador(codigo_fonte, **self.opcoes))
+            raise
+        tamanho = estimar_memoria(compilador)
+
+        with self._trava:
+            existente = self._entradas.get(chave)
+            if existente is not None:
+                # Outra thread compilou a mesma expressão enquanto isso
+                return existente[0]
+            self._entradas[chave] = (compilador, tamanho)
+            self.memoria += tamanho
+            self._remover_excedentes()
+        return compilador
+
+    @staticmethod
+    def _gerar_codigo(compilador):
+        """Executa todas as etapas menos a avaliação"""
+        for etapa in compilador.dependencias:
+            if etapa != 'resultado':
+                compilador.executar(etapa)
+
+    def avaliar(self, codigo_fonte: str):
+        return self.compilar(codigo_fonte).resultado
+
+    def _remover_excedentes(self):
+        while self._entradas and (
+                len(self._entradas) > self.tamanho_maximo
+                or (self.memoria_maxima is not None and self.memoria > self.memoria_maxima)):
+            _, (_, tamanho) = self._entradas.popitem(last=False)
+            self.memoria -= tamanho
+            self.remocoes += 1
+
+    def limpar(self):
+        with self._trava:
+            self._entradas.clear()
+            self.memoria = 0
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                'entradas': len(self._entradas),
+                'memoria': self.memoria,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'remocoes': self.remocoes,
+            }
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, codigo_fonte):
+        return normalizar(codigo_fonte) in self._entradas
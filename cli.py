@@ -0,0 +1,126 @@
+"""Avaliação em lote sem interface gráfica.
+
+Lê uma expressão por linha da entrada padrão ou dos arquivos indicados e
+escreve um registro por linha, em JSON lines ou CSV, à medida que lê: a
+memória usada não depende do tamanho da entrada. Linhas em branco são
+puladas; um erro numa linha vira o campo "erro" do registro dela, sem
+interromper as demais. Um arquivo que não pode ser aberto é recusado antes
+de qualquer saída.
+
+Uso: python cli.py [arquivos...] [--emitir resultado,tokens,tac,otimizado,assembly]
+                   [--formato jsonl|csv] [--avaliador vm|python|arvore] [--dobrar]
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+
+from compilador import Compilador
+
+ARTEFATOS = ('resultado', 'tokens', 'tac', 'otimizado', 'assembly')
+
+# Como cada artefato é lido do Compilador; só as etapas necessárias rodam
+EXTRATORES = {
+    'resultado': lambda c: c.resultado,
+    'tokens': lambda c: [[tok.type, tok.value] for tok in c.tokens],
+    'tac': lambda c: [str(instr) for instr in c.instrucoes_tac],
+    'otimizado': lambda c: [str(instr) for instr in c.instrucoes_otimizadas],
+    'assembly': lambda c: [str(instr) for instr in c.instrucoes_assembly],
+}
+
+
+def ler_linhas(arquivos):
+    """Gera (origem, número da linha, texto) de cada linha não vazia"""
+    if not arquivos:
+        arquivos = ['-']
+    for nome in arquivos:
+        # Bytes inválidos viram U+FFFD, que o léxico recusa só naquela linha
+        arquivo = sys.stdin if nome == '-' else open(nome, encoding='utf-8', errors='replace')
+        try:
+            for numero, linha in enumerate(arquivo, 1):
+                texto = linha.strip()
+                if texto:
+                    yield nome, numero, texto
+        finally:
+            if arquivo is not sys.stdin:
+                arquivo.close()
+
+
+def processar(linhas, artefatos=('resultado',), **opcoes):
+    """Gera um registro (dict) por linha; `opcoes` vão para o Compilador"""
+    for origem, numero, texto in linhas:
+        registro = {'origem': origem, 'linha': numero, 'expressao': texto}
+        try:
+            compilador = Compilador(texto, **opcoes)
+            for artefato in artefatos:
+                registro[artefato] = EXTRATORES[artefato](compilador)
+            registro['erro'] = None
+        except Exception as e:
+            registro['erro'] = str(e)
+        yield registro
+
+
+def formatar_jsonl(registros):
+    for registro in registros:
+        yield json.dumps(registro, ensure_ascii=False) + "\n"
+
+
+def formatar_csv(registros, artefatos):
+    colunas = ['origem', 'linha', 'expressao', *artefatos, 'erro']
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, colunas, extrasaction='ignore')
+    escritor.writeheader()
+    for registro in registros:
+        for artefato in artefatos:
+            valor = registro.get(artefato)
+            if isinstance(valor, list):
+                # Listas ocupam uma célula: itens separados por "; "
+                registro[artefato] = "; ".join(
+                    " ".join(map(str, item)) if isinstance(item, list) else item for item in valor)
+        escritor.writerow(registro)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Compila e avalia expressões, uma por linha")
+    parser.add_argument('arquivos', nargs='*', help="arquivos de entrada ('-' ou nenhum: stdin)")
+    parser.add_argument('--emitir', default='resultado',
+                        help=f"artefatos separados por vírgula, entre {', '.join(ARTEFATOS)}")
+    parser.add_argument('--formato', choices=('jsonl', 'csv'), default='jsonl')
+    parser.add_argument('--avaliador', choices=('vm', 'python', 'arvore'), default='vm')
+    parser.add_argument('--dobrar', action='store_true',
+                        help="dobra as subexpressões constantes já na análise sintática")
+    args = parser.parse_args(argumentos)
+
+    artefatos = [a.strip() for a in args.emitir.split(',') if a.strip()]
+    for artefato in artefatos:
+        if artefato not in ARTEFATOS:
+            parser.error(f"artefato desconhecido: {artefato}")
+    for nome in args.arquivos:
+        if nome != '-':
+            try:
+                open(nome, 'rb').close()
+            except OSError as e:
+                parser.error(f"não foi possível abrir {nome}: {e.strerror}")
+
+    registros = processar(ler_linhas(args.arquivos), artefatos, avaliador=args.avaliador,
+                          dobrar=args.dobrar)
+    if args.formato == 'csv':
+        saida = formatar_csv(registros, artefatos)
+    else:
+        saida = formatar_jsonl(registros)
+
+    try:
+        for texto in saida:
+            sys.stdout.write(texto)
+    except BrokenPipeError:
+        # Leitor fechou a saída (por exemplo, `| head`); não há mais o que fazer
+        sys.stderr.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
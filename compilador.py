@@ -1,42 +1,247 @@
-from sintatico.analisador_sintatico import AnalisadorSintatico
-from semantico.analisador_semantico import AnalisadorSemantico
-from geracao_codigo.gerador_tac import GeradorTAC
+from sintatico.arena import ArenaAST
+from sintatico.dobramento import FabricaDobramento
+from sintatico.nos_ast import FabricaCompartilhada
+from sintatico.registro import registro_global
+from passe_fundido import PasseFundido
 from geracao_codigo.otimizador import Otimizador
 from geracao_codigo.gerador_assembly import GeradorCodigo
-from interpretador import Interpretador
+from geracao_codigo.alocador_registradores import AlocadorRegistradores
+from geracao_codigo.bytecode import GeradorBytecode
+from geracao_codigo.gerador_python import GeradorPython
+from interpretador import Interpretador, valor_variavel
+from maquina_virtual import MaquinaVirtual
+from instrumentacao import LexicoCronometrado
+
+# Etapa -> etapas de que ela depende. A etapa 'semantica' é uma travessia
+# só (PasseFundido) que verifica a árvore e já produz o TAC, as estatísticas
+# da AST e, com o avaliador "arvore", o valor pela árvore; um erro semântico
+# continua interrompendo qualquer etapa seguinte.
+DEPENDENCIAS = {
+    'analise': (),
+    'semantica': ('analise',),
+    'otimizacao': ('semantica',),
+    'alocacao': ('otimizacao',),
+    'assembly': ('alocacao',),
+    'programa': ('otimizacao',),
+    'resultado': ('programa',),
+}
+
+
+def _artefato(etapa, nome):
+    """Atributo somente leitura que executa `etapa` (e as anteriores) no primeiro acesso"""
+    privado = '_' + nome
+
+    def obter(self):
+        if etapa not in self.etapas_executadas:
+            self.executar(etapa)
+        return getattr(self, privado)
+
+    obter.__doc__ = f"Produzido pela etapa '{etapa}'"
+    return property(obter)
 
 
 class Compilador:
-    def __init__(self, codigo_fonte: str):
+    """Pipeline do compilador em etapas preguiçosas e memorizadas.
+
+    Cada artefato (tokens, ast, instrucoes_tac, assembly, resultado...) é
+    calculado no primeiro acesso, junto com as etapas de que depende, e
+    reaproveitado depois. `compilar()` executa todas as etapas.
+    """
+
+    tokens = _artefato('analise', 'tokens')
+    ast = _artefato('analise', 'ast')
+    variaveis = _artefato('analise', 'variaveis')
+    arena = _artefato('analise', 'arena')
+    estatisticas_ast = _artefato('semantica', 'estatisticas_ast')
+    instrucoes_tac = _artefato('semantica', 'instrucoes_tac')
+    instrucoes_otimizadas = _artefato('otimizacao', 'instrucoes_otimizadas')
+    estatisticas_otimizacao = _artefato('otimizacao', 'estatisticas_otimizacao')
+    reescritas_otimizacao = _artefato('otimizacao', 'reescritas_otimizacao')
+    relatorio_alocacao = _artefato('alocacao', 'relatorio_alocacao')
+    assembly = _artefato('assembly', 'assembly')
+    instrucoes_assembly = _artefato('assembly', 'instrucoes_assembly')
+    programa = _artefato('programa', 'programa')
+    funcao = _artefato('programa', 'funcao')
+    resultado = _artefato('resultado', 'resultado')
+
+    def __init__(self, codigo_fonte: str, registro=None, analisador='ply', lexico='ply', arena=False,
+                 compartilhar=False, registradores=None, avaliador='vm', instrumentacao=None,
+                 valores=None, dobrar=False):
         self.codigo_fonte = codigo_fonte
-        self.tokens = []
-        self.ast = None
-        self.instrucoes_tac = []
-        self.instrucoes_otimizadas = []
-        self.assembly = ""
-        self.resultado = None
+        # Valores das variáveis da expressão, usados por resultado/avaliar()
+        self.valores = valores
+        self.registro = registro if registro is not None else registro_global
+        self.tipo_analisador = analisador
+        self.tipo_lexico = lexico
+        self.usar_arena = arena
+        self.compartilhar = compartilhar
+        # Dobra as subexpressões constantes já na análise sintática (FabricaDobramento)
+        self.dobrar = dobrar
+        # Quantidade ou nomes dos registradores; None mantém um local por temporário
+        if isinstance(registradores, int):
+            registradores = [f"R{i}" for i in range(registradores)]
+        self.registradores = registradores
+        # 'vm' executa o bytecode do TAC otimizado; 'python' chama uma função
+        # Python compilada a partir dele; 'arvore' percorre a AST
+        if avaliador not in ('vm', 'python', 'arvore'):
+            raise Exception(f"Avaliador desconhecido: {avaliador}")
+        self.avaliador = avaliador
 
-    def compilar(self):
-        analisador = AnalisadorSintatico()
-        self.ast = analisador.analisar(self.codigo_fonte)
+        self.dependencias = dict(DEPENDENCIAS)
+        if avaliador == 'arvore':
+            # O Interpretador só precisa da AST já verificada
+            self.dependencias['resultado'] = ('semantica',)
+        self.etapas_executadas = set()
+        # Instrumentacao que mede cada etapa; None desliga a medição
+        self.instrumentacao = instrumentacao
+        self.lexico_cronometrado = None
+
+        self._tokens = []
+        self._ast = None
+        self._variaveis = []
+        self._arena = None
+        self._estatisticas_ast = {}
+        self._instrucoes_tac = []
+        self._saida_tac = None
+        # Valor (ou mensagem de erro) calculado pelo PasseFundido com `valores`,
+        # só com o avaliador "arvore"
+        self._valor_arvore = None
+        self._erro_arvore = None
+        self._instrucoes_otimizadas = []
+        self._estatisticas_otimizacao = {}
+        self._reescritas_otimizacao = {}
+        self._alocacao = None
+        self._relatorio_alocacao = None
+        self._assembly = ""
+        self._instrucoes_assembly = []
+        self._programa = None
+        self._funcao = None
+        self._parametros = []
+        self._avaliador_vetorial = None
+        self._resultado = None
+
+    def ordem_etapas(self, etapa):
+        """Etapas necessárias para `etapa`, na ordem em que rodam (ela incluída)"""
+        ordem = []
 
-        analisador.analisador_lexico.tokenizar(self.codigo_fonte)
-        self.tokens = analisador.analisador_lexico.tokens_list
+        def incluir(nome):
+            if nome in ordem:
+                return
+            for dependencia in self.dependencias[nome]:
+                incluir(dependencia)
+            ordem.append(nome)
 
-        analisador_semantico = AnalisadorSemantico()
-        analisador_semantico.visitar(self.ast)
+        incluir(etapa)
+        return ordem
 
-        gerador_tac = GeradorTAC()
-        gerador_tac.visitar(self.ast)
-        self.instrucoes_tac = gerador_tac.instrucoes
+    def executar(self, etapa):
+        """Executa `etapa` e as dependências que ainda não rodaram"""
+        for nome in self.ordem_etapas(etapa):
+            if nome not in self.etapas_executadas:
+                if self.instrumentacao is None:
+                    getattr(self, f'etapa_{nome}')()
+                else:
+                    self.instrumentacao.medir(self, nome)
+                self.etapas_executadas.add(nome)
+
+    def visitar(self, passe):
+        if self._arena is not None:
+            return self._arena.aceitar(passe)
+        return passe.visitar(self._ast)
+
+    def etapa_analise(self):
+        fabrica = None
+        if self.usar_arena:
+            fabrica = self._arena = ArenaAST(self.compartilhar)
+        elif self.compartilhar:
+            fabrica = FabricaCompartilhada()
+        if self.dobrar:
+            fabrica = FabricaDobramento(fabrica)
+        analisador = self.registro.analisador(self.tipo_analisador, self.tipo_lexico, fabrica)
+        if self.instrumentacao is not None:
+            analisador.analisador_lexico = self.lexico_cronometrado = \
+                LexicoCronometrado(analisador.analisador_lexico)
+        self._ast = analisador.analisar(self.codigo_fonte)
+        if self.dobrar:
+            # Uma raiz constante ainda não existe na fábrica base
+            self._ast = fabrica.no(self._ast)
+        if self._arena is not None:
+            self._ast = self._arena.no()
+
+        self._tokens = analisador.obter_tokens()
+        # Pelos tokens, sem mais uma travessia da árvore
+        self._variaveis = list(dict.fromkeys(
+            tok.value for tok in self._tokens if tok.type == 'IDENTIFICADOR'))
+
+    def etapa_semantica(self):
+        passe = PasseFundido(self.compartilhar, cse=self.compartilhar, reservados=self._variaveis,
+                             variaveis=self.valores, avaliar=self.avaliador == 'arvore')
+        self._saida_tac, self._valor_arvore = self.visitar(passe)
+        self._erro_arvore = passe.erro
+        self._instrucoes_tac = passe.instrucoes
+        self._estatisticas_ast = passe.estatisticas()
+
+    def etapa_otimizacao(self):
+        otimizador = Otimizador(self._instrucoes_tac)
+        self._instrucoes_otimizadas = otimizador.otimizar()
+        self._estatisticas_otimizacao = otimizador.estatisticas
+        self._reescritas_otimizacao = otimizador.reescritas
+
+    def etapa_alocacao(self):
+        if self.registradores is not None:
+            alocador = AlocadorRegistradores(self._instrucoes_otimizadas, self.registradores)
+            self._alocacao = alocador.alocar()
+            self._relatorio_alocacao = alocador.relatorio
+
+    def etapa_assembly(self):
+        gerador_codigo = GeradorCodigo(self._instrucoes_otimizadas, self._alocacao)
+        self._assembly = gerador_codigo.gerar()
+        self._instrucoes_assembly = gerador_codigo.assembly
+
+    def etapa_programa(self):
+        if self.avaliador == 'python':
+            gerador = GeradorPython(self._instrucoes_otimizadas, self._saida_tac)
+            self._funcao = gerador.compilar()
+            self._parametros = gerador.parametros
+        elif self.avaliador == 'vm':
+            self._programa = GeradorBytecode(self._instrucoes_otimizadas, self._saida_tac).gerar()
+
+    def etapa_resultado(self):
+        self._resultado = self.avaliar()
+
+    def compilar(self):
+        for etapa in self.dependencias:
+            self.executar(etapa)
+        return self._resultado
 
-        otimizador = Otimizador(self.instrucoes_tac)
-        self.instrucoes_otimizadas = otimizador.otimizar()
+    def avaliar(self, valores=None):
+        """Avalia o programa já compilado; só o avaliador "arvore", com valores
+        diferentes dos dados ao construir, volta a percorrer a AST.
 
-        gerador_codigo = GeradorCodigo(self.instrucoes_otimizadas)
-        self.assembly = gerador_codigo.gerar()
+        `valores` (nome -> número) substitui os valores das variáveis dados ao
+        construir; o valor devolvido não altera `resultado`.
+        """
+        if valores is None:
+            valores = self.valores
+        if self.avaliador == 'arvore':
+            self.executar('semantica')
+            if valores is not self.valores:
+                return self.visitar(Interpretador(self.compartilhar, valores))
+            if self._erro_arvore is not None:
+                raise Exception(self._erro_arvore)
+            # Já calculado pela travessia da etapa semântica
+            return self._valor_arvore
+        self.executar('programa')
+        if self.avaliador == 'vm':
+            return MaquinaVirtual().executar(self._programa, valores)
+        return self._funcao(*[valor_variavel(valores, nome) for nome in self._parametros])
 
-        interpretador = Interpretador()
-        self.resultado = interpretador.visitar(self.ast)
+    def avaliar_vetorial(self, colunas, mascara=False):
+        """Avalia o TAC otimizado sobre colunas NumPy (nome -> array); ver AvaliadorVetorial"""
+        if self._avaliador_vetorial is None:
+            # NumPy só é necessário para a avaliação vetorial
+            from avaliador_vetorial import AvaliadorVetorial
 
-        return self.resultado
\ No newline at end of file
+            self.executar('otimizacao')
+            self._avaliador_vetorial = AvaliadorVetorial(self._instrucoes_otimizadas, self._saida_tac)
+        return self._avaliador_vetorial.avaliar(colunas, mascara)
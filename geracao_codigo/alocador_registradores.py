@@ -0,0 +1,128 @@
+from typing import List
+from .gerador_tac import InstrucaoTAC
+
+
+def analisar_vivacidade(instrucoes: List[InstrucaoTAC]):
+    """Intervalo de vida de cada temporário: (definição, último uso).
+
+    O TAC é uma sequência sem desvios em que cada temporário é definido uma
+    única vez, então a vivacidade se reduz a esses intervalos. O resultado da
+    última instrução é a saída e fica vivo até o fim do programa.
+    """
+    intervalos = {}
+    for indice, instr in enumerate(instrucoes):
+        for arg in (instr.arg1, instr.arg2):
+            if arg in intervalos:
+                intervalos[arg][1] = indice
+        intervalos[instr.resultado] = [indice, indice]
+
+    if instrucoes:
+        intervalos[instrucoes[-1].resultado][1] = len(instrucoes)
+    return {temp: tuple(intervalo) for temp, intervalo in intervalos.items()}
+
+
+class RelatorioAlocacao:
+    def __init__(self, temporarios, registradores, pressao_maxima, spills, locais):
+        self.temporarios = temporarios
+        self.registradores = registradores
+        self.pressao_maxima = pressao_maxima
+        self.spills = spills
+        self.locais = locais
+
+    def __repr__(self):
+        return (f"{self.temporarios} temporários -> {self.locais} locais "
+                f"({self.registradores} registradores disponíveis), "
+                f"pressão máxima {self.pressao_maxima}, {self.spills} spills")
+
+
+class AlocadorRegistradores:
+    """Alocação por varredura linear (linear scan) dos temporários do TAC.
+
+    Cada temporário recebe um registrador de `registradores` ou, quando
+    faltam registradores, uma posição de memória `M<n>` (spill), reutilizada
+    por temporários cujos intervalos não se sobrepõem. O destino
+    de uma instrução pode reutilizar o registrador do primeiro operando se
+    ele morre ali, mas nunca o do segundo, já que o código gerado copia o
+    primeiro operando para o destino antes de aplicar a operação.
+    """
+
+    def __init__(self, instrucoes: List[InstrucaoTAC], registradores=('R0', 'R1', 'R2', 'R3')):
+        self.instrucoes = instrucoes
+        self.registradores = tuple(registradores)
+        self.alocacao = {}
+        self.relatorio = None
+
+    def pressao_maxima(self, intervalos):
+        """Maior número de temporários vivos ao mesmo tempo"""
+        variacao = [0] * (len(self.instrucoes) + 2)
+        for inicio, fim in intervalos.values():
+            variacao[inicio] += 1
+            variacao[fim + 1] -= 1
+
+        vivos = maximo = 0
+        for delta in variacao:
+            vivos += delta
+            maximo = max(maximo, vivos)
+        return maximo
+
+    def alocar(self):
+        intervalos = analisar_vivacidade(self.instrucoes)
+        livres = list(reversed(self.registradores))
+        # Temporários ocupando registradores, com o fim do intervalo de cada um
+        ativos = {}
+        # Fim do último temporário guardado em cada posição de memória
+        fim_memoria = []
+        spills = 0
+        alocacao = {}
+
+        def posicao_memoria(temp):
+            inicio, fim = intervalos[temp]
+            for posicao, ocupada_ate in enumerate(fim_memoria):
+                if ocupada_ate < inicio:
+                    break
+            else:
+                posicao = len(fim_memoria)
+                fim_memoria.append(None)
+            fim_memoria[posicao] = fim
+            return f"M{posicao}"
+
+        for indice, instr in enumerate(self.instrucoes):
+            for temp, fim in list(ativos.items()):
+                if fim < indice:
+                    del ativos[temp]
+                    livres.append(alocacao[temp])
+
+            # O primeiro operando morre aqui: o destino pode ficar com o registrador dele
+            arg1 = instr.arg1
+            if arg1 in ativos and ativos[arg1] == indice:
+                del ativos[arg1]
+                livres.append(alocacao[arg1])
+
+            temp = instr.resultado
+            fim = intervalos[temp][1]
+
+            if livres:
+                alocacao[temp] = livres.pop()
+                ativos[temp] = fim
+                continue
+
+            # Sem registrador livre: vai para a memória quem vive mais tempo
+            vitima = max(ativos, key=ativos.get, default=None)
+            if vitima is not None and ativos[vitima] > fim:
+                alocacao[temp] = alocacao[vitima]
+                ativos[temp] = fim
+                del ativos[vitima]
+                alocacao[vitima] = posicao_memoria(vitima)
+            else:
+                alocacao[temp] = posicao_memoria(temp)
+            spills += 1
+
+        self.alocacao = alocacao
+        self.relatorio = RelatorioAlocacao(
+            temporarios=len(intervalos),
+            registradores=len(self.registradores),
+            pressao_maxima=self.pressao_maxima(intervalos),
+            spills=spills,
+            locais=len(set(alocacao.values())),
+        )
+        return alocacao
@@ -0,0 +1,134 @@
+from array import array
+from typing import List
+from sintatico.nos_ast import chave_constante
+from .gerador_tac import InstrucaoTAC
+
+CONST = 0
+LOAD = 1
+STORE = 2
+ADD = 3
+SUB = 4
+MUL = 5
+DIV = 6
+SHL = 7
+VAR = 8
+
+OPCODES = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '<<': SHL}
+NOMES = {CONST: 'CONST', LOAD: 'LOAD', STORE: 'STORE', ADD: 'ADD', SUB: 'SUB',
+         MUL: 'MUL', DIV: 'DIV', SHL: 'SHL', VAR: 'VAR'}
+
+
+class ProgramaBytecode:
+    """Bytecode de pilha: opcodes e operandos em arrays paralelos.
+
+    O operando de CONST indexa `constantes`; o de LOAD/STORE, os locais; o de
+    VAR, os nomes em `variaveis`, cujos valores são dados na execução. O
+    código não tem desvios e o resultado é o topo da pilha no final.
+    """
+
+    def __init__(self):
+        self.codigos = array('B')
+        self.operandos = array('l')
+        self.constantes = []
+        self.variaveis = []
+        self.num_locais = 0
+
+    def emitir(self, codigo, operando=0):
+        self.codigos.append(codigo)
+        self.operandos.append(operando)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __repr__(self):
+        linhas = []
+        for codigo, operando in zip(self.codigos, self.operandos):
+            if codigo == CONST:
+                linhas.append(f"CONST {self.constantes[operando]!r}")
+            elif codigo == VAR:
+                linhas.append(f"VAR {self.variaveis[operando]}")
+            elif codigo in (LOAD, STORE):
+                linhas.append(f"{NOMES[codigo]} {operando}")
+            else:
+                linhas.append(NOMES[codigo])
+        return "\n".join(linhas)
+
+
+class GeradorBytecode:
+    """Traduz o TAC (em geral, a saída do Otimizador) para ProgramaBytecode.
+
+    `saida` é o operando com o resultado quando não há instruções (uma
+    expressão que é só um número); nos outros casos é o resultado da última
+    instrução. Um temporário lido só pela instrução seguinte à que o define
+    fica na pilha, sem STORE/LOAD. Operandos de texto que nenhuma instrução
+    define são variáveis.
+    """
+
+    def __init__(self, instrucoes: List[InstrucaoTAC], saida=None):
+        self.instrucoes = instrucoes
+        self.saida = saida
+        self.programa = ProgramaBytecode()
+        self._locais = {}
+        self._indice_constante = {}
+        self._indice_variavel = {}
+        self._temporarios = {instr.resultado for instr in instrucoes}
+
+    def local(self, temp):
+        if temp not in self._locais:
+            self._locais[temp] = len(self._locais)
+        return self._locais[temp]
+
+    def constante(self, valor):
+        chave = chave_constante(valor)
+        if chave not in self._indice_constante:
+            self._indice_constante[chave] = len(self.programa.constantes)
+            self.programa.constantes.append(valor)
+        return self._indice_constante[chave]
+
+    def variavel(self, nome):
+        if nome not in self._indice_variavel:
+            self._indice_variavel[nome] = len(self.programa.variaveis)
+            self.programa.variaveis.append(nome)
+        return self._indice_variavel[nome]
+
+    def empilhar(self, arg):
+        if isinstance(arg, str):
+            if arg in self._temporarios:
+                self.programa.emitir(LOAD, self.local(arg))
+            else:
+                self.programa.emitir(VAR, self.variavel(arg))
+        else:
+            self.programa.emitir(CONST, self.constante(arg))
+
+    def gerar(self):
+        instrucoes = self.instrucoes
+        if not instrucoes:
+            self.empilhar(self.saida)
+            return self.programa
+
+        usos = {}
+        for instr in instrucoes:
+            for arg in (instr.arg1, instr.arg2):
+                if isinstance(arg, str):
+                    usos[arg] = usos.get(arg, 0) + 1
+
+        no_topo = None
+        for indice, instr in enumerate(instrucoes):
+            if instr.arg1 != no_topo:
+                self.empilhar(instr.arg1)
+            if instr.arg2 is not None:
+                self.empilhar(instr.arg2)
+                self.programa.emitir(OPCODES[instr.op])
+
+            # Fica na pilha se for lido uma única vez, como primeiro operando da próxima
+            proxima = instrucoes[indice + 1] if indice + 1 < len(instrucoes) else None
+            if proxima is None:
+                break
+            if proxima.arg1 == instr.resultado and usos.get(instr.resultado) == 1:
+                no_topo = instr.resultado
+            else:
+                self.programa.emitir(STORE, self.local(instr.resultado))
+                no_topo = None
+
+        self.programa.num_locais = len(self._locais)
+        return self.programa
@@ -1,28 +1,121 @@
 from typing import List
 from .gerador_tac import InstrucaoTAC
 
+MAPA_OP = {
+    '+': 'ADD',
+    '-': 'SUB',
+    '*': 'MUL',
+    '/': 'DIV',
+    '<<': 'SHL'
+}
+
+
+class InstrucaoAssembly:
+    __slots__ = ('op', 'destino', 'origem')
+
+    def __init__(self, op, destino, origem):
+        self.op = op
+        self.destino = destino
+        self.origem = origem
+
+    def __repr__(self):
+        return f"{self.op} {self.destino}, {self.origem}"
+
+
+class OtimizadorPeephole:
+    """Otimizações locais sobre a lista de InstrucaoAssembly.
+
+    - `MOV a, a` é removido.
+    - `MOV d, s` logo depois de uma instrução que escreveu `s` é fundido
+      quando `s` não é mais lido: a instrução é removida e `d` passa a ser
+      chamado de `s` daí em diante. Só vale quando cada local é definido por
+      um único MOV (sem alocação de registradores); com alocação, o próprio
+      alocador já coloca o destino no registrador do primeiro operando.
+
+    As contagens de cada regra ficam em `contagem`.
+    """
+
+    def __init__(self):
+        self.contagem = {}
+
+    def contar(self, regra):
+        self.contagem[regra] = self.contagem.get(regra, 0) + 1
+
+    def otimizar(self, instrucoes):
+        definicoes = {}
+        ultimo_uso = {}
+        for indice, instr in enumerate(instrucoes):
+            if instr.op == 'MOV':
+                definicoes[instr.destino] = definicoes.get(instr.destino, 0) + 1
+            else:
+                ultimo_uso[instr.destino] = indice
+            if isinstance(instr.origem, str):
+                ultimo_uso[instr.origem] = indice
+        uma_definicao = all(quantidade == 1 for quantidade in definicoes.values())
+
+        renomear = {}
+        saida = []
+        for indice, instr in enumerate(instrucoes):
+            destino = renomear.get(instr.destino, instr.destino)
+            origem = renomear.get(instr.origem, instr.origem) if isinstance(instr.origem, str) else instr.origem
+
+            if instr.op == 'MOV':
+                if destino == origem:
+                    self.contar('mov_redundante')
+                    continue
+                if uma_definicao and isinstance(origem, str) and saida and saida[-1].destino == origem \
+                        and ultimo_uso[instr.origem] == indice:
+                    renomear[instr.destino] = origem
+                    self.contar('mov_fundido')
+                    continue
+
+            if destino is instr.destino and origem is instr.origem:
+                saida.append(instr)
+            else:
+                saida.append(InstrucaoAssembly(instr.op, destino, origem))
+
+        return saida
+
 
 class GeradorCodigo:
-    def __init__(self, instrucoes: List[InstrucaoTAC]):
+    def __init__(self, instrucoes: List[InstrucaoTAC], alocacao=None, peephole=True):
         self.instrucoes = instrucoes
+        self.alocacao = alocacao or {}
+        self.peephole = OtimizadorPeephole() if peephole else None
         self.assembly = []
+        self.temporarios = {instr.resultado for instr in instrucoes}
+
+    def local(self, arg):
+        """Registrador ou posição de memória do temporário; constantes ficam como estão.
 
-    def gerar(self):
-        self.assembly.append("Código Assembly Gerado")
-        self.assembly.append(" ")
+        Variáveis (operandos que nenhuma instrução define) são lidas da
+        memória pelo nome, entre colchetes, para não se confundirem com
+        registradores.
+        """
+        if not isinstance(arg, str):
+            return arg
+        if arg not in self.temporarios:
+            return f"[{arg}]"
+        return self.alocacao.get(arg, arg)
 
+    def gerar(self, estruturado=False):
+        """Gera o assembly; com `estruturado=True` devolve a lista de InstrucaoAssembly"""
         for instr in self.instrucoes:
-            if instr.arg2 is None:
-                self.assembly.append(f"MOV {instr.resultado}, {instr.arg1}")
-            else:
-                mapa_op = {
-                    '+': 'ADD',
-                    '-': 'SUB',
-                    '*': 'MUL',
-                    '/': 'DIV'
-                }
+            resultado, arg1 = self.local(instr.resultado), self.local(instr.arg1)
+            self.assembly.append(InstrucaoAssembly('MOV', resultado, arg1))
+            if instr.arg2 is not None:
+                self.assembly.append(InstrucaoAssembly(MAPA_OP[instr.op], resultado, self.local(instr.arg2)))
+
+        if self.peephole is not None:
+            self.assembly = self.peephole.otimizar(self.assembly)
+
+        if estruturado:
+            return self.assembly
 
-                self.assembly.append(f"MOV {instr.resultado}, {instr.arg1}")
-                self.assembly.append(f"{mapa_op[instr.op]} {instr.resultado}, {instr.arg2}")
+        linhas = ["Código Assembly Gerado", " "]
+        linhas.extend(map(repr, self.assembly))
+        return "\n".join(linhas)
 
-        return "\n".join(self.assembly)
\ No newline at end of file
+    def local_resultado(self):
+        """Onde fica o resultado do programa depois de gerar()"""
+        return self.assembly[-1].destino if self.assembly else None
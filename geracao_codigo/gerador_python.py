@@ -0,0 +1,68 @@
+import math
+from functools import lru_cache
+from typing import List
+from .gerador_tac import InstrucaoTAC
+
+ERRO_DIVISAO = "Erro: Divisão por zero"
+
+
+@lru_cache(maxsize=1024)
+def compilar_fonte(fonte: str):
+    """Compila o código gerado uma única vez por texto e devolve a função `avaliar`"""
+    ambiente = {'inf': math.inf, 'nan': math.nan}
+    exec(compile(fonte, '<expressao>', 'exec'), ambiente)
+    return ambiente['avaliar']
+
+
+class GeradorPython:
+    """Traduz o TAC otimizado para uma função Python.
+
+    Cada instrução vira uma atribuição a uma variável local; antes de uma
+    divisão por operando que não é constante não nula, é gerado um teste que
+    levanta o mesmo erro do Interpretador. `saida` tem o mesmo papel que no
+    GeradorBytecode. As variáveis da expressão viram os parâmetros v0, v1...
+    da função, na ordem de `parametros`, para que nenhum nome escolhido pelo
+    usuário colida com palavras reservadas do Python.
+    """
+
+    def __init__(self, instrucoes: List[InstrucaoTAC], saida=None):
+        self.instrucoes = instrucoes
+        self.saida = saida
+        self.parametros = []
+        self._temporarios = {instr.resultado for instr in instrucoes}
+        self._nomes = {}
+
+    def operando(self, arg):
+        if isinstance(arg, str):
+            if arg in self._temporarios:
+                return arg
+            if arg not in self._nomes:
+                self._nomes[arg] = f"v{len(self.parametros)}"
+                self.parametros.append(arg)
+            return self._nomes[arg]
+        # repr(inf) e repr(nan) resolvem para os nomes do ambiente de compilar_fonte
+        texto = repr(arg)
+        return f"({texto})" if texto.startswith('-') else texto
+
+    def gerar(self) -> str:
+        linhas = []
+        for instr in self.instrucoes:
+            arg1 = self.operando(instr.arg1)
+            if instr.arg2 is None:
+                linhas.append(f"    {instr.resultado} = {arg1}")
+                continue
+            arg2 = self.operando(instr.arg2)
+            if instr.op == '/' and (isinstance(instr.arg2, str) or instr.arg2 == 0):
+                linhas.append(f"    if {arg2} == 0:")
+                linhas.append(f"        raise Exception({ERRO_DIVISAO!r})")
+            linhas.append(f"    {instr.resultado} = {arg1} {instr.op} {arg2}")
+
+        if self.instrucoes:
+            linhas.append(f"    return {self.instrucoes[-1].resultado}")
+        else:
+            linhas.append(f"    return {self.operando(self.saida)}")
+        linhas.insert(0, f"def avaliar({', '.join(self._nomes.values())}):")
+        return "\n".join(linhas) + "\n"
+
+    def compilar(self):
+        return compilar_fonte(self.gerar())
@@ -1,5 +1,6 @@
 from typing import List
-from sintatico.nos_ast import NoAST, NoNumero, NoOperacaoBinaria
+from sintatico.nos_ast import NoNumero, NoVariavel, NoOperacaoBinaria, chave_constante
+from sintatico.visitante import Visitante
 
 
 class InstrucaoTAC:
@@ -16,30 +17,63 @@ class InstrucaoTAC:
             return f"{self.resultado} = {self.arg1}"
 
 
-class GeradorTAC:
-    def __init__(self):
+def chave_operando(arg):
+    """Chave ordenável de um operando TAC; separa 1 de 1.0, 0.0 de -0.0 e
+    literais de temporários"""
+    if isinstance(arg, str):
+        return (0, arg)
+    return (1, type(arg).__name__) + chave_constante(arg)[1:]
+
+
+class GeradorTAC(Visitante):
+    """Gera código de três endereços.
+
+    Com `cse=True`, aplica numeração de valores: uma operação com os mesmos
+    operandos de uma anterior (a menos da ordem, para `+` e `*`) reaproveita
+    o temporário dela em vez de gerar outra instrução.
+
+    Variáveis aparecem no TAC pelo próprio nome, como os temporários; os
+    nomes em `reservados` (as variáveis da expressão) nunca são usados para
+    temporários.
+    """
+
+    comutativos = frozenset('+*')
+
+    def __init__(self, compartilhar=False, cse=False, reservados=()):
+        super().__init__(compartilhar)
         self.instrucoes = []
         self.contador_temp = 0
+        self.valores = {} if cse else None
+        self.reservados = frozenset(reservados)
 
     def novo_temp(self):
         temp = f"t{self.contador_temp}"
         self.contador_temp += 1
+        while temp in self.reservados:
+            temp = f"t{self.contador_temp}"
+            self.contador_temp += 1
         return temp
 
-    def visitar(self, no: NoAST):
-        nome_metodo = f'visitar_{type(no).__name__}'
-        visitador = getattr(self, nome_metodo)
-        return visitador(no)
-
     def visitar_NoNumero(self, no: NoNumero):
         return no.valor
 
-    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria):
-        esquerda = self.visitar(no.esquerda)
-        direita = self.visitar(no.direita)
+    def visitar_NoVariavel(self, no: NoVariavel):
+        return no.nome
+
+    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria, esquerda, direita):
+        if self.valores is not None:
+            chaves = (chave_operando(esquerda), chave_operando(direita))
+            if no.op in self.comutativos:
+                chaves = tuple(sorted(chaves))
+            chave = (no.op,) + chaves
+            temp = self.valores.get(chave)
+            if temp is not None:
+                return temp
 
         temp = self.novo_temp()
         instrucao = InstrucaoTAC(no.op, esquerda, direita, temp)
         self.instrucoes.append(instrucao)
 
+        if self.valores is not None:
+            self.valores[chave] = temp
         return temp
@@ -1,25 +1,250 @@
+import math
+import time
 from typing import List
-from .gerador_tac import InstrucaoTAC
+from .gerador_tac import InstrucaoTAC, chave_operando
+
+
+def eh_constante(arg):
+    return isinstance(arg, (int, float))
+
+
+def calcular(op, arg1, arg2):
+    """Aplica `op` a duas constantes; devolve None se não for seguro dobrar"""
+    if op == '+':
+        return arg1 + arg2
+    elif op == '-':
+        return arg1 - arg2
+    elif op == '*':
+        return arg1 * arg2
+    elif op == '/':
+        # A divisão por zero fica para a execução, que reporta o erro
+        if arg2 == 0:
+            return None
+        return arg1 / arg2
+    elif op == '<<':
+        return arg1 << arg2
+    return None
+
+
+def tipo_operando(arg, tipos):
+    """int ou float para constantes e temporários de tipo conhecido; None se desconhecido"""
+    if eh_constante(arg):
+        return type(arg)
+    return tipos.get(arg)
+
+
+def tipo_resultado(instr, tipos):
+    tipo1 = tipo_operando(instr.arg1, tipos)
+    if instr.arg2 is None:
+        return tipo1
+    if instr.op == '/':
+        return float
+    tipo2 = tipo_operando(instr.arg2, tipos)
+    if tipo1 is None or tipo2 is None:
+        return None
+    return float if float in (tipo1, tipo2) else int
+
+
+def reciproco_exato(c, exato=True):
+    """1/c quando ele é representável e, com `exato`, exato (c potência de
+    dois); senão None"""
+    try:
+        # Ints grandes demais para float estouram já no frexp
+        if c == 0 or (exato and math.frexp(abs(c))[0] != 0.5):
+            return None
+        reciproco = 1 / c
+    except OverflowError:
+        return None
+    # 1/c que estoura ou vira zero não é aproximação de nada
+    if math.isinf(reciproco) or reciproco == 0:
+        return None
+    return reciproco
+
+
+def assinatura(instrucoes):
+    return tuple((i.op, chave_operando(i.arg1), chave_operando(i.arg2), i.resultado) for i in instrucoes)
+
+
+class EstatisticaPasso:
+    def __init__(self, nome):
+        self.nome = nome
+        self.execucoes = 0
+        self.antes = None
+        self.depois = None
+        self.tempo = 0.0
+
+    def registrar(self, antes, depois, tempo):
+        if self.antes is None:
+            self.antes = antes
+        self.depois = depois
+        self.execucoes += 1
+        self.tempo += tempo
+
+    def __repr__(self):
+        return (f"{self.nome}: {self.antes} -> {self.depois} instruções, "
+                f"{self.execucoes} execuções, {self.tempo * 1e3:.3f} ms")
 
 
 class Otimizador:
-    def __init__(self, instrucoes: List[InstrucaoTAC]):
+    """Gerenciador de passes sobre o TAC.
+
+    Roda os passes de `passos`, em ordem, até que uma rodada inteira não
+    altere mais o programa (ou até `max_iteracoes`). O resultado da última
+    instrução é a saída do programa e nunca é removido. As estatísticas de
+    cada passe ficam em `estatisticas` e as reescritas algébricas aplicadas,
+    por regra, em `reescritas`.
+
+    `politica_float` controla as reescritas que podem mudar um resultado em
+    ponto flutuante: 'exata' só aplica as que dão o mesmo valor e o mesmo
+    tipo que o Interpretador; 'rapida' também troca divisão por qualquer
+    constante pela multiplicação pelo inverso, soma zero a floats (o que
+    perde o sinal de -0.0) e reassocia constantes em floats.
+    """
+
+    passos_padrao = ('propagacao', 'dobramento', 'simplificacao', 'eliminacao_mortos')
+
+    def __init__(self, instrucoes: List[InstrucaoTAC], passos=None, max_iteracoes=50,
+                 politica_float='exata'):
         self.instrucoes = instrucoes
+        self.passos = list(passos) if passos is not None else list(self.passos_padrao)
+        self.max_iteracoes = max_iteracoes
+        self.politica_float = politica_float
+        self.estatisticas = {}
+        self.reescritas = {}
+        self.iteracoes = 0
+
+    def resolver_passo(self, passo):
+        """Um passo é o nome de um método `passo_<nome>` ou um callable(instrucoes)"""
+        if callable(passo):
+            return getattr(passo, '__name__', repr(passo)), passo
+        return passo, getattr(self, f"passo_{passo}")
+
+    def passo_propagacao(self, instrucoes):
+        """Substitui usos de temporários definidos por cópia (`t = x`) pelo valor copiado"""
+        valores = {}
+        resultado = []
 
-    def dobramento_constantes(self):
+        for instr in instrucoes:
+            arg1 = valores.get(instr.arg1, instr.arg1) if isinstance(instr.arg1, str) else instr.arg1
+            arg2 = valores.get(instr.arg2, instr.arg2) if isinstance(instr.arg2, str) else instr.arg2
+            if instr.arg2 is None:
+                valores[instr.resultado] = arg1
+            if arg1 is instr.arg1 and arg2 is instr.arg2:
+                resultado.append(instr)
+            else:
+                resultado.append(InstrucaoTAC(instr.op, arg1, arg2, instr.resultado))
+
+        return resultado
+
+    def passo_dobramento(self, instrucoes):
+        return self.dobramento_constantes(instrucoes)
+
+    def passo_eliminacao_mortos(self, instrucoes):
+        """Remove instruções cujo resultado nunca é lido"""
+        if not instrucoes:
+            return instrucoes
+
+        vivos = {instrucoes[-1].resultado}
+        resultado = []
+        for instr in reversed(instrucoes):
+            if instr.resultado not in vivos:
+                continue
+            resultado.append(instr)
+            for arg in (instr.arg1, instr.arg2):
+                if isinstance(arg, str):
+                    vivos.add(arg)
+
+        resultado.reverse()
+        return resultado
+
+    def passo_simplificacao(self, instrucoes):
+        """Identidades algébricas, redução de força e reassociação de constantes"""
+        usos = {}
+        for instr in instrucoes:
+            for arg in (instr.arg1, instr.arg2):
+                if isinstance(arg, str):
+                    usos[arg] = usos.get(arg, 0) + 1
+
+        tipos = {}
+        definicoes = {}
+        resultado = []
+        for instr in instrucoes:
+            instr = self.simplificar(instr, tipos, usos, definicoes)
+            tipos[instr.resultado] = tipo_resultado(instr, tipos)
+            definicoes[instr.resultado] = instr
+            resultado.append(instr)
+
+        return resultado
+
+    def reescrever(self, regra, op, arg1, arg2, resultado):
+        self.reescritas[regra] = self.reescritas.get(regra, 0) + 1
+        return InstrucaoTAC(op, arg1, arg2, resultado)
+
+    def simplificar(self, instr, tipos, usos, definicoes):
+        op, arg1, arg2 = instr.op, instr.arg1, instr.arg2
+        if arg2 is None or eh_constante(arg1) == eh_constante(arg2):
+            return instr
+
+        constante_a_esquerda = eh_constante(arg1)
+        x, c = (arg2, arg1) if constante_a_esquerda else (arg1, arg2)
+        tipo_x = tipo_operando(x, tipos)
+        rapida = self.politica_float == 'rapida'
+        # Trocar `x op c` por x só preserva o tipo se c for int ou x já for float
+        preserva_tipo = type(c) is int or tipo_x is float
+
+        if op == '*':
+            if c == 1 and preserva_tipo:
+                return self.reescrever('x*1', '=', x, None, instr.resultado)
+            if c == 2 and preserva_tipo:
+                return self.reescrever('x*2 -> x+x', '+', x, x, instr.resultado)
+            if type(c) is int and c > 2 and c & (c - 1) == 0 and tipo_x is int:
+                return self.reescrever('x*2^k -> x<<k', '<<', x, c.bit_length() - 1, instr.resultado)
+        elif op == '+':
+            if c == 0 and ((type(c) is int and tipo_x is int) or rapida):
+                return self.reescrever('x+0', '=', x, None, instr.resultado)
+        elif op == '-' and not constante_a_esquerda:
+            # x - (-0.0) equivale a x + 0.0, que não preserva -0.0
+            if c == 0 and math.copysign(1, c) > 0 and tipo_x is not None and preserva_tipo:
+                return self.reescrever('x-0', '=', x, None, instr.resultado)
+        elif op == '/' and not constante_a_esquerda:
+            if c == 1 and tipo_x is float:
+                return self.reescrever('x/1', '=', x, None, instr.resultado)
+            # Com x int (ou de tipo desconhecido), x*(1/c) converteria x para
+            # float antes de dividir: estoura com ints grandes e arredonda duas vezes
+            if tipo_x is float or rapida:
+                reciproco = reciproco_exato(c, exato=not rapida)
+                if reciproco is not None:
+                    return self.reescrever('x/c -> x*(1/c)', '*', x, reciproco, instr.resultado)
+
+        if op in ('+', '*') and usos.get(x) == 1 and x in definicoes:
+            reassociada = self.reassociar(op, x, c, instr.resultado, tipos, definicoes)
+            if reassociada is not None:
+                return reassociada
+
+        return instr
+
+    def reassociar(self, op, temp, c2, resultado, tipos, definicoes):
+        """(x op c1) op c2 -> x op (c1 op c2), com temp = x op c1 usado só aqui"""
+        anterior = definicoes[temp]
+        if anterior.op != op or eh_constante(anterior.arg1) == eh_constante(anterior.arg2):
+            return None
+        x, c1 = (anterior.arg2, anterior.arg1) if eh_constante(anterior.arg1) else (anterior.arg1, anterior.arg2)
+
+        # Somas e produtos de inteiros são exatos; de floats, só na política rápida
+        exata = tipo_operando(x, tipos) is int and type(c1) is int and type(c2) is int
+        if not (exata or self.politica_float == 'rapida'):
+            return None
+        return self.reescrever('reassociacao', op, x, calcular(op, c1, c2), resultado)
+
+    def dobramento_constantes(self, instrucoes=None):
         otimizado = []
 
-        for instr in self.instrucoes:
-            if isinstance(instr.arg1, (int, float)) and isinstance(instr.arg2, (int, float)):
-                if instr.op == '+':
-                    resultado = instr.arg1 + instr.arg2
-                elif instr.op == '-':
-                    resultado = instr.arg1 - instr.arg2
-                elif instr.op == '*':
-                    resultado = instr.arg1 * instr.arg2
-                elif instr.op == '/':
-                    resultado = instr.arg1 / instr.arg2
+        for instr in self.instrucoes if instrucoes is None else instrucoes:
+            resultado = None
+            if eh_constante(instr.arg1) and eh_constante(instr.arg2):
+                resultado = calcular(instr.op, instr.arg1, instr.arg2)
 
+            if resultado is not None:
                 otimizado.append(InstrucaoTAC('=', resultado, None, instr.resultado))
             else:
                 otimizado.append(instr)
@@ -27,4 +252,24 @@ class Otimizador:
         return otimizado
 
     def otimizar(self):
-        return self.dobramento_constantes()
\ No newline at end of file
+        passos = [self.resolver_passo(passo) for passo in self.passos]
+        instrucoes = self.instrucoes
+        self.iteracoes = 0
+
+        while self.iteracoes < self.max_iteracoes:
+            self.iteracoes += 1
+            inicio_rodada = assinatura(instrucoes)
+
+            for nome, passo in passos:
+                antes = len(instrucoes)
+                inicio = time.perf_counter()
+                instrucoes = passo(instrucoes)
+                tempo = time.perf_counter() - inicio
+                if nome not in self.estatisticas:
+                    self.estatisticas[nome] = EstatisticaPasso(nome)
+                self.estatisticas[nome].registrar(antes, len(instrucoes), tempo)
+
+            if assinatura(instrucoes) == inicio_rodada:
+                break
+
+        return instrucoes
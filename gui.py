@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from compilador import Compilador
+from instrumentacao import Instrumentacao
 
 
 class InterfaceGrafica:
@@ -319,6 +320,7 @@ class InterfaceGrafica:
         # Dados
         tokens_data = [
             ("NUMERO", "0-9 .", "Números inteiros ou decimais"),
+            ("IDENTIFICADOR", "a-z A-Z _ 0-9", "Nome de variável"),
             ("MAIS", "+", "Operador de Adição"),
             ("MENOS", "-", "Operador de Subtração"),
             ("MULTIPLICAR", "*", "Operador de Multiplicação"),
@@ -374,35 +376,6 @@ class InterfaceGrafica:
         for nome in ['resultado', 'tokens', 'ast', 'semantica', 'tac', 'otimizado', 'assembly']:
             getattr(self, f"{nome}_texto").delete(1.0, tk.END)
 
-    def contar_nos_tipo(self, no, tipo_nome):
-        """Conta quantos nós de um determinado tipo existem na AST"""
-        if no is None:
-            return 0
-
-        contador = 1 if type(no).__name__ == tipo_nome else 0
-
-        if hasattr(no, 'esquerda') and hasattr(no, 'direita'):
-            contador += self.contar_nos_tipo(no.esquerda, tipo_nome)
-            contador += self.contar_nos_tipo(no.direita, tipo_nome)
-
-        return contador
-
-    def extrair_operacoes(self, no):
-        """Extrai todas as operações da AST"""
-        if no is None:
-            return []
-
-        operacoes = []
-
-        if hasattr(no, 'op'):
-            operacoes.append(no.op)
-
-        if hasattr(no, 'esquerda') and hasattr(no, 'direita'):
-            operacoes.extend(self.extrair_operacoes(no.esquerda))
-            operacoes.extend(self.extrair_operacoes(no.direita))
-
-        return operacoes
-
     def nome_operacao(self, op):
         """Retorna o nome da operação"""
         nomes = {
@@ -413,53 +386,6 @@ class InterfaceGrafica:
         }
         return nomes.get(op, 'Desconhecida')
 
-    def verificar_divisoes(self, no):
-        """Verifica todas as divisões na AST e extrai seus operandos"""
-        if no is None:
-            return []
-
-        divisoes = []
-
-        if hasattr(no, 'op') and no.op == '/':
-            # Extrai valor ou expressão do lado esquerdo
-            if hasattr(no.esquerda, 'valor'):
-                val_esq = no.esquerda.valor
-            else:
-                val_esq = str(no.esquerda)
-
-            # Extrai valor ou expressão do lado direito
-            if hasattr(no.direita, 'valor'):
-                val_dir = no.direita.valor
-            else:
-                val_dir = str(no.direita)
-
-            divisoes.append((val_esq, val_dir))
-
-        # Busca recursivamente nas sub-árvores
-        if hasattr(no, 'esquerda'):
-            divisoes.extend(self.verificar_divisoes(no.esquerda))
-        if hasattr(no, 'direita'):
-            divisoes.extend(self.verificar_divisoes(no.direita))
-
-        return divisoes
-
-    def extrair_valores(self, no):
-        """Extrai todos os valores numéricos da AST"""
-        if no is None:
-            return []
-
-        valores = []
-
-        if hasattr(no, 'valor'):
-            valores.append(no.valor)
-
-        if hasattr(no, 'esquerda'):
-            valores.extend(self.extrair_valores(no.esquerda))
-        if hasattr(no, 'direita'):
-            valores.extend(self.extrair_valores(no.direita))
-
-        return valores
-
     def compilar_expressao(self):
         """Compila a expressão e exibe os resultados"""
         print("\n" + "=" * 60)
@@ -487,7 +413,9 @@ class InterfaceGrafica:
             print("   ✓ Saídas limpas")
 
             print("\n4. Iniciando compilação...")
-            compilador = Compilador(expressao)
+            instrumentacao = Instrumentacao(
+                lambda m: print(f"   · {m.etapa}: {m.tempo * 1000:.3f} ms {m.contagens or ''}"))
+            compilador = Compilador(expressao, instrumentacao=instrumentacao)
             resultado = compilador.compilar()
             print(f"   ✓ Compilação concluída! Resultado: {resultado}")
 
@@ -538,9 +466,10 @@ class InterfaceGrafica:
             # Análise Semântica
             self.semantica_texto.insert(tk.END, "Análise Semântica:\n", "header")
 
-            # Conta nós na AST
-            num_numeros = self.contar_nos_tipo(compilador.ast, 'NoNumero')
-            num_operacoes = self.contar_nos_tipo(compilador.ast, 'NoOperacaoBinaria')
+            # Estatísticas coletadas na mesma travessia da análise semântica
+            estatisticas = compilador.estatisticas_ast
+            num_numeros = estatisticas['nos']['NoNumero']
+            num_operacoes = estatisticas['nos']['NoOperacaoBinaria']
 
             self.semantica_texto.insert(tk.END, f"Números verificados: {num_numeros}\n")
             self.semantica_texto.insert(tk.END, f"Operações verificadas: {num_operacoes}\n")
@@ -551,12 +480,12 @@ class InterfaceGrafica:
             self.semantica_texto.insert(tk.END, "Detalhes da Análise:\n", "header")
 
             # Valores encontrados
-            valores = self.extrair_valores(compilador.ast)
+            valores = estatisticas['literais']
             if valores:
                 self.semantica_texto.insert(tk.END, f"Valores encontrados: {', '.join(map(str, valores))}\n\n", "info")
 
             # Operações identificadas
-            operacoes = self.extrair_operacoes(compilador.ast)
+            operacoes = estatisticas['sequencia_operacoes']
             if operacoes:
                 self.semantica_texto.insert(tk.END, "Operações identificadas:\n", "info")
                 for i, op in enumerate(operacoes, 1):
@@ -565,7 +494,7 @@ class InterfaceGrafica:
                 self.semantica_texto.insert(tk.END, "\n")
 
             # Verificar divisões
-            divisoes = self.verificar_divisoes(compilador.ast)
+            divisoes = estatisticas['divisoes']
             if divisoes:
                 self.semantica_texto.insert(tk.END, "Verificação de divisões:\n", "info")
                 for i, (div_esq, div_dir) in enumerate(divisoes, 1):
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+
+from sintatico.visitante import percorrer
+
+
+class Medicao:
+    """Tempo e contagens de uma etapa de uma compilação"""
+
+    __slots__ = ('etapa', 'tempo', 'contagens', 'expressao', 'erro')
+
+    def __init__(self, etapa, tempo, contagens, expressao, erro=None):
+        self.etapa = etapa
+        self.tempo = tempo
+        self.contagens = contagens
+        self.expressao = expressao
+        self.erro = erro
+
+    def como_dict(self):
+        return {
+            'etapa': self.etapa,
+            'tempo': self.tempo,
+            'contagens': self.contagens,
+            'expressao': self.expressao,
+            'erro': self.erro,
+        }
+
+    def __repr__(self):
+        if self.erro is not None:
+            return f"Medicao({self.etapa}, {self.tempo * 1e6:.1f} us, erro={self.erro!r})"
+        return f"Medicao({self.etapa}, {self.tempo * 1e6:.1f} us, {self.contagens})"
+
+
+class LexicoCronometrado:
+    """Repassa input/token ao analisador léxico e acumula o tempo gasto neles"""
+
+    def __init__(self, lexico):
+        self.lexico = lexico
+        self.tempo = 0.0
+
+    def input(self, texto):
+        inicio = time.perf_counter()
+        self.lexico.input(texto)
+        self.tempo += time.perf_counter() - inicio
+
+    def token(self):
+        inicio = time.perf_counter()
+        tok = self.lexico.token()
+        self.tempo += time.perf_counter() - inicio
+        return tok
+
+    @property
+    def tokens_list(self):
+        return self.lexico.tokens_list
+
+
+def _contar_nos(compilador):
+    return sum(1 for _ in percorrer(compilador.ast))
+
+
+# Contagens registradas ao fim de cada etapa (lidas só com a instrumentação ligada)
+CONTAGENS = {
+    'semantica': lambda c: {'nos_ast': sum(c.estatisticas_ast['nos'].values()),
+                            'instrucoes_tac': len(c.instrucoes_tac)},
+    'otimizacao': lambda c: {'instrucoes_tac': len(c.instrucoes_tac),
+                             'instrucoes_otimizadas': len(c.instrucoes_otimizadas)},
+    'assembly': lambda c: {'linhas_assembly': len(c.instrucoes_assembly)},
+}
+
+
+class Instrumentacao:
+    """Mede as etapas do Compilador e entrega cada Medicao aos destinos.
+
+    Um destino é qualquer chamável que recebe uma Medicao, como
+    AgregadorMedicoes e DestinoJSONLinhas. A etapa 'analise' é registrada
+    como 'lexico' e 'sintatico', já que o parser consome os tokens à medida
+    que o lexer os produz. Sem instrumentação, o Compilador não paga nada
+    além de um teste por etapa.
+    """
+
+    def __init__(self, *destinos):
+        self.destinos = list(destinos)
+
+    def adicionar(self, destino):
+        self.destinos.append(destino)
+        return destino
+
+    def emitir(self, medicao):
+        for destino in self.destinos:
+            destino(medicao)
+
+    def medir(self, compilador, etapa):
+        inicio = time.perf_counter()
+        try:
+            getattr(compilador, f'etapa_{etapa}')()
+        except Exception as e:
+            tempo = time.perf_counter() - inicio
+            self.emitir(Medicao(etapa, tempo, {}, compilador.codigo_fonte, str(e)))
+            raise
+        tempo = time.perf_counter() - inicio
+        # Marcada antes das contagens, que leem os artefatos pelas propriedades
+        compilador.etapas_executadas.add(etapa)
+
+        expressao = compilador.codigo_fonte
+        if etapa == 'analise':
+            lexico = compilador.lexico_cronometrado
+            tempo_lexico = lexico.tempo if lexico is not None else 0.0
+            self.emitir(Medicao('lexico', tempo_lexico, {'tokens': len(compilador.tokens)}, expressao))
+            self.emitir(Medicao('sintatico', tempo - tempo_lexico,
+                                {'nos_ast': _contar_nos(compilador)}, expressao))
+            return
+
+        contar = CONTAGENS.get(etapa)
+        self.emitir(Medicao(etapa, tempo, contar(compilador) if contar else {}, expressao))
+
+
+class AgregadorMedicoes:
+    """Guarda as medições em memória e resume os tempos por etapa"""
+
+    def __init__(self):
+        self.tempos = {}
+        self.contagens = {}
+        self.erros = {}
+        self._trava = threading.Lock()
+
+    def __call__(self, medicao):
+        with self._trava:
+            if medicao.erro is not None:
+                self.erros[medicao.etapa] = self.erros.get(medicao.etapa, 0) + 1
+                return
+            self.tempos.setdefault(medicao.etapa, []).append(medicao.tempo)
+            totais = self.contagens.setdefault(medicao.etapa, {})
+            for nome, valor in medicao.contagens.items():
+                totais[nome] = totais.get(nome, 0) + valor
+
+    @staticmethod
+    def percentil(ordenados, p):
+        """Percentil `p` (0 a 100) por interpolação linear"""
+        if not ordenados:
+            return None
+        posicao = (len(ordenados) - 1) * p / 100
+        baixo = int(posicao)
+        alto = min(baixo + 1, len(ordenados) - 1)
+        return ordenados[baixo] + (ordenados[alto] - ordenados[baixo]) * (posicao - baixo)
+
+    def resumo(self, percentis=(50, 90, 99)):
+        with self._trava:
+            resumo = {}
+            for etapa, tempos in self.tempos.items():
+                ordenados = sorted(tempos)
+                dados = {
+                    'n': len(ordenados),
+                    'total': sum(ordenados),
+                    'media': sum(ordenados) / len(ordenados),
+                    'max': ordenados[-1],
+                }
+                for p in percentis:
+                    dados[f'p{p}'] = self.percentil(ordenados, p)
+                dados['contagens'] = dict(self.contagens.get(etapa, {}))
+                dados['erros'] = self.erros.get(etapa, 0)
+                resumo[etapa] = dados
+            return resumo
+
+    def limpar(self):
+        with self._trava:
+            self.tempos.clear()
+            self.contagens.clear()
+            self.erros.clear()
+
+
+class DestinoJSONLinhas:
+    """Escreve uma linha JSON por medição num arquivo já aberto"""
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self._trava = threading.Lock()
+
+    def __call__(self, medicao):
+        linha = json.dumps(medicao.como_dict(), ensure_ascii=False)
+        with self._trava:
+            self.arquivo.write(linha + "\n")
@@ -1,27 +1,37 @@
-from sintatico.nos_ast import NoAST, NoNumero, NoOperacaoBinaria
+from sintatico.nos_ast import NoNumero, NoVariavel, NoOperacaoBinaria
+from sintatico.visitante import Visitante
 
 
-class Interpretador:
+def valor_variavel(variaveis, nome):
+    if variaveis is None or nome not in variaveis:
+        raise Exception(f"Erro: Variável '{nome}' não definida")
+    return variaveis[nome]
 
-    def visitar(self, no: NoAST):
-        nome_metodo = f'visitar_{type(no).__name__}'
-        visitador = getattr(self, nome_metodo)
-        return visitador(no)
+
+def aplicar_operacao(op, esquerda, direita):
+    if op == '+':
+        return esquerda + direita
+    elif op == '-':
+        return esquerda - direita
+    elif op == '*':
+        return esquerda * direita
+    elif op == '/':
+        if direita == 0:
+            raise Exception("Erro: Divisão por zero")
+        return esquerda / direita
+
+
+class Interpretador(Visitante):
+
+    def __init__(self, compartilhar=False, variaveis=None):
+        super().__init__(compartilhar)
+        self.variaveis = variaveis
 
     def visitar_NoNumero(self, no: NoNumero):
         return no.valor
 
-    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria):
-        esquerda = self.visitar(no.esquerda)
-        direita = self.visitar(no.direita)
-
-        if no.op == '+':
-            return esquerda + direita
-        elif no.op == '-':
-            return esquerda - direita
-        elif no.op == '*':
-            return esquerda * direita
-        elif no.op == '/':
-            if direita == 0:
-                raise Exception("Erro: Divisão por zero")
-            return esquerda / direita
\ No newline at end of file
+    def visitar_NoVariavel(self, no: NoVariavel):
+        return valor_variavel(self.variaveis, no.nome)
+
+    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria, esquerda, direita):
+        return aplicar_operacao(no.op, esquerda, direita)
@@ -1,9 +1,14 @@
-import ply.lex as lex
+import hashlib
+import importlib.util
+import os
+import shutil
+import tempfile
 
 
 class AnalisadorLexico:
     tokens = (
         'NUMERO',
+        'IDENTIFICADOR',
         'MAIS',
         'MENOS',
         'VEZES',
@@ -12,6 +17,7 @@ class AnalisadorLexico:
         'PAREN_DIR',
     )
 
+    t_IDENTIFICADOR = r'[A-Za-z_][A-Za-z0-9_]*'
     t_MAIS = r'\+'
     t_MENOS = r'-'
     t_VEZES = r'\*'
@@ -33,21 +39,70 @@ class AnalisadorLexico:
     def t_error(self, t):
         raise Exception(f"Token inválido '{t.value[0]}' na posição {t.lexpos}")
 
-    def __init__(self):
-        self.lexer = lex.lex(module=self)
+    def __init__(self, lexer=None, diretorio_tabelas=None):
+        self.lexer = lexer if lexer is not None else self._construir_lexer(diretorio_tabelas)
         self.tokens_list = []
 
+    @classmethod
+    def assinatura(cls):
+        """Hash das regras léxicas, usado para versionar a tabela em disco"""
+        regras = [repr(cls.tokens)]
+        for nome in sorted(vars(cls)):
+            if nome.startswith('t_'):
+                valor = vars(cls)[nome]
+                regras.append(f"{nome}={valor.__doc__ if callable(valor) else valor}")
+        return hashlib.sha1("\n".join(regras).encode('utf-8')).hexdigest()[:16]
+
+    def _construir_lexer(self, diretorio_tabelas):
+        # Importado só aqui para que carregar o módulo não custe o import do PLY
+        import ply.lex as lex
+
+        if diretorio_tabelas is None:
+            return lex.lex(module=self)
+
+        nome_tabela = f"lextab_{self.assinatura()}"
+        caminho = os.path.join(diretorio_tabelas, nome_tabela + '.py')
+        if os.path.exists(caminho):
+            try:
+                spec = importlib.util.spec_from_file_location(nome_tabela, caminho)
+                tabela = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(tabela)
+                return lex.lex(module=self, optimize=True, lextab=tabela)
+            except Exception:
+                # Tabela truncada ou corrompida: é tratada como velha e regenerada
+                pass
+
+        # O PLY grava a tabela direto no destino; ela é gerada num diretório
+        # temporário e movida com os.replace, para que outro processo nunca
+        # leia um arquivo pela metade
+        os.makedirs(diretorio_tabelas, exist_ok=True)
+        temporario = tempfile.mkdtemp(dir=diretorio_tabelas)
+        try:
+            lexer = lex.lex(module=self, optimize=True, lextab=nome_tabela, outputdir=temporario)
+            os.replace(os.path.join(temporario, nome_tabela + '.py'), caminho)
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+        return lexer
+
     def tokenizar(self, texto):
+        self.input(texto)
+        while self.token():
+            pass
+
+        return self.tokens_list
+
+    # Interface de lexer do PLY: o parser consome os tokens por aqui e eles
+    # ficam registrados em tokens_list, evitando uma segunda tokenização
+    def input(self, texto):
         self.tokens_list = []
+        self.lexer.lineno = 1
         self.lexer.input(texto)
 
-        while True:
-            tok = self.lexer.token()
-            if not tok:
-                break
+    def token(self):
+        tok = self.lexer.token()
+        if tok:
             self.tokens_list.append(tok)
-
-        return self.tokens_list
+        return tok
 
     def obter_lexer(self):
-        return self.lexer
\ No newline at end of file
+        return self.lexer
@@ -0,0 +1,186 @@
+import re
+from array import array
+
+from .analisador_lexico import AnalisadorLexico
+from .tipos_token import TipoToken
+
+# Nome do token no PLY -> TipoToken
+TIPO_POR_NOME = {
+    'NUMERO': TipoToken.NUMERO,
+    'IDENTIFICADOR': TipoToken.IDENTIFICADOR,
+    'MAIS': TipoToken.MAIS,
+    'MENOS': TipoToken.MENOS,
+    'VEZES': TipoToken.MULTIPLICAR,
+    'DIVIDIR': TipoToken.DIVIDIR,
+    'PAREN_ESQ': TipoToken.PAREN_ESQ,
+    'PAREN_DIR': TipoToken.PAREN_DIR,
+}
+
+# Códigos compactos guardados no fluxo: índice de cada TipoToken
+TIPOS = list(TipoToken)
+CODIGO = {tipo: i for i, tipo in enumerate(TIPOS)}
+NOME_PLY = {CODIGO[tipo]: nome for nome, tipo in TIPO_POR_NOME.items()}
+
+
+def _compilar_padrao(binario=False):
+    """Junta as regras do AnalisadorLexico em uma única regex com grupos nomeados"""
+    regras = [('NUMERO', AnalisadorLexico.t_NUMERO.__doc__)]
+    for nome in AnalisadorLexico.tokens:
+        regra = getattr(AnalisadorLexico, f"t_{nome}")
+        if isinstance(regra, str):
+            regras.append((nome, regra))
+    regras.append(('IGNORAR', f"[{re.escape(AnalisadorLexico.t_ignore)}]+"))
+    regras.append(('NOVA_LINHA', AnalisadorLexico.t_newline.__doc__))
+    regras.append(('ERRO', '.'))
+    padrao = '|'.join(f"(?P<{nome}>{regra})" for nome, regra in regras)
+    return re.compile(padrao.encode('ascii') if binario else padrao, re.DOTALL)
+
+
+PADRAO = _compilar_padrao()
+# As mesmas regras sobre bytes, para varrer buffers (bytes, mmap, memoryview) sem decodificá-los
+PADRAO_BYTES = _compilar_padrao(binario=True)
+
+
+class VisaoToken:
+    """Visão preguiçosa de um token do fluxo, com a interface do LexToken"""
+
+    # 'lexer' é preenchido pelo PLY no token de erro antes de chamar p_error
+    __slots__ = ('fluxo', 'indice', 'lexer')
+
+    def __init__(self, fluxo, indice):
+        self.fluxo = fluxo
+        self.indice = indice
+
+    @property
+    def tipo(self):
+        return TIPOS[self.fluxo.tipos[self.indice]]
+
+    @property
+    def type(self):
+        return NOME_PLY[self.fluxo.tipos[self.indice]]
+
+    @property
+    def value(self):
+        return self.fluxo.valores[self.indice]
+
+    @property
+    def lexpos(self):
+        return self.fluxo.posicoes[self.indice]
+
+    @property
+    def lineno(self):
+        return self.fluxo.linhas[self.indice]
+
+    def __str__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+    def __repr__(self):
+        return str(self)
+
+
+class FluxoTokens:
+    """Tokens em arrays paralelos: código do tipo, valor, posição e linha.
+
+    Se a varredura encontrou um caractere inválido, `posicao_erro` guarda a
+    posição dele; o erro só é levantado quando o consumidor chega lá, como
+    acontece com o lexer do PLY.
+    """
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.valores = []
+        self.posicoes = array('l')
+        self.linhas = array('l')
+        self.posicao_erro = None
+        self.caractere_erro = None
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self.tipos)
+        if not 0 <= indice < len(self.tipos):
+            raise IndexError(indice)
+        return VisaoToken(self, indice)
+
+    def __iter__(self):
+        for indice in range(len(self.tipos)):
+            yield VisaoToken(self, indice)
+
+    def verificar_erro(self):
+        if self.posicao_erro is not None:
+            raise Exception(f"Token inválido '{self.caractere_erro}' na posição {self.posicao_erro}")
+
+
+class AnalisadorLexicoRapido:
+    """Lexer de alta vazão: uma varredura com a regex combinada das regras do
+    AnalisadorLexico, produzindo um FluxoTokens em vez de objetos LexToken.
+
+    Tem a mesma interface de lexer (input/token) e de tokens_list do
+    AnalisadorLexico, então pode ser usado pelos dois analisadores sintáticos.
+    """
+
+    def __init__(self):
+        self.fluxo = FluxoTokens()
+        self.proximo = 0
+
+    @property
+    def tokens_list(self):
+        return self.fluxo
+
+    def varrer(self, texto):
+        """Tokeniza `texto`, que pode ser str ou um buffer de bytes ASCII"""
+        binario = not isinstance(texto, str)
+        padrao = PADRAO_BYTES if binario else PADRAO
+        ponto = b'.' if binario else '.'
+        fluxo = FluxoTokens()
+        tipos = fluxo.tipos
+        valores = fluxo.valores
+        posicoes = fluxo.posicoes
+        linhas = fluxo.linhas
+        codigo_numero = CODIGO[TipoToken.NUMERO]
+        codigos = {nome: CODIGO[tipo] for nome, tipo in TIPO_POR_NOME.items()}
+        linha = 1
+
+        for m in padrao.finditer(texto):
+            nome = m.lastgroup
+            if nome == 'IGNORAR':
+                continue
+            if nome == 'NOVA_LINHA':
+                linha += len(m.group())
+                continue
+            if nome == 'ERRO':
+                fluxo.posicao_erro = m.start()
+                fluxo.caractere_erro = m.group().decode('utf-8', 'replace') if binario else m.group()
+                break
+
+            lexema = m.group()
+            if nome == 'NUMERO':
+                tipos.append(codigo_numero)
+                valores.append(float(lexema) if ponto in lexema else int(lexema))
+            else:
+                tipos.append(codigos[nome])
+                valores.append(lexema.decode('ascii') if binario else lexema)
+            posicoes.append(m.start())
+            linhas.append(linha)
+
+        return fluxo
+
+    def tokenizar(self, texto):
+        self.input(texto)
+        self.fluxo.verificar_erro()
+        return self.fluxo
+
+    # Interface de lexer do PLY
+    def input(self, texto):
+        self.fluxo = self.varrer(texto)
+        self.proximo = 0
+
+    def token(self):
+        if self.proximo >= len(self.fluxo.tipos):
+            self.fluxo.verificar_erro()
+            return None
+        tok = VisaoToken(self.fluxo, self.proximo)
+        self.proximo += 1
+        return tok
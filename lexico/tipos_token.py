@@ -3,6 +3,7 @@ from enum import Enum
 
 class TipoToken(Enum):
     NUMERO = "NUMERO"
+    IDENTIFICADOR = "IDENTIFICADOR"
     MAIS = "MAIS"
     MENOS = "MENOS"
     MULTIPLICAR = "MULTIPLICAR"
@@ -0,0 +1,104 @@
+"""Compilação em lote de muitas expressões independentes, em vários processos."""
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from compilador import Compilador
+from sintatico.registro import registro_global
+
+# Opções do Compilador em cada processo trabalhador, definidas por _iniciar_trabalhador
+_opcoes = {}
+
+
+class ItemLote:
+    """Resultado de uma expressão do lote; `erro` é a mensagem, ou None"""
+
+    __slots__ = ('indice', 'expressao', 'resultado', 'erro')
+
+    def __init__(self, indice, expressao, resultado, erro):
+        self.indice = indice
+        self.expressao = expressao
+        self.resultado = resultado
+        self.erro = erro
+
+    def __repr__(self):
+        if self.erro is not None:
+            return f"ItemLote({self.indice}, {self.expressao!r}, erro={self.erro!r})"
+        return f"ItemLote({self.indice}, {self.expressao!r}, {self.resultado!r})"
+
+
+def _aquecer():
+    # Constrói as tabelas do PLY uma vez, antes do primeiro bloco
+    registro_global.analisador().analisar("1 + 1")
+
+
+def _iniciar_trabalhador(opcoes):
+    global _opcoes
+    _opcoes = opcoes
+    _aquecer()
+
+
+def _compilar_bloco(bloco, opcoes=None):
+    """Avalia um bloco; sem `opcoes`, usa as do processo trabalhador"""
+    if opcoes is None:
+        opcoes = _opcoes
+    saida = []
+    for indice, expressao in bloco:
+        try:
+            saida.append((indice, expressao, Compilador(expressao, **opcoes).resultado, None))
+        except Exception as e:
+            saida.append((indice, expressao, None, str(e)))
+    return saida
+
+
+def _blocos(expressoes, chunk_size):
+    numeradas = enumerate(expressoes)
+    while True:
+        bloco = list(itertools.islice(numeradas, chunk_size))
+        if not bloco:
+            return
+        yield bloco
+
+
+def compilar_lote(expressoes, workers=None, chunk_size=256, ordenado=True, **opcoes):
+    """Avalia `expressoes` num pool de processos e gera um ItemLote por expressão.
+
+    A entrada é consumida aos poucos: no máximo `2 * workers` blocos de
+    `chunk_size` expressões ficam em andamento. Com `ordenado=False`, os
+    blocos saem na ordem em que terminam. `opcoes` vão para o Compilador e
+    precisam ser serializáveis (pickle). Com `workers=1`, roda no próprio
+    processo, sem pool.
+    """
+    workers = workers or os.cpu_count() or 1
+    blocos = _blocos(expressoes, chunk_size)
+
+    if workers == 1:
+        # As opções vão em cada chamada: o global _opcoes é dos trabalhadores,
+        # e outros geradores deste processo podem estar em andamento
+        _aquecer()
+        for bloco in blocos:
+            for item in _compilar_bloco(bloco, opcoes):
+                yield ItemLote(*item)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_iniciar_trabalhador, initargs=(opcoes,)) as executor:
+        limite = 2 * workers
+        pendentes = deque()
+        for bloco in itertools.chain(blocos, [None]):
+            if bloco is not None:
+                pendentes.append(executor.submit(_compilar_bloco, bloco))
+                if len(pendentes) < limite:
+                    continue
+
+            # Janela cheia (ou entrada esgotada): entrega o que já pode sair
+            while pendentes and (len(pendentes) >= limite or bloco is None):
+                if ordenado:
+                    prontos = [pendentes.popleft()]
+                else:
+                    prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                    for futuro in prontos:
+                        pendentes.remove(futuro)
+                for futuro in prontos:
+                    for item in futuro.result():
+                        yield ItemLote(*item)
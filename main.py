@@ -1,10 +1,11 @@
-import tkinter as tk
-from gui import InterfaceGrafica
-
 def main():
+    # tkinter só é carregado quando a interface gráfica é de fato aberta
+    import tkinter as tk
+    from gui import InterfaceGrafica
+
     raiz = tk.Tk()
     aplicacao = InterfaceGrafica(raiz)
     raiz.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
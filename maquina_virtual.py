@@ -0,0 +1,43 @@
+from geracao_codigo.bytecode import CONST, LOAD, STORE, ADD, SUB, MUL, DIV, SHL, VAR
+from interpretador import valor_variavel
+
+
+class MaquinaVirtual:
+    """Executa um ProgramaBytecode com uma pilha de operandos"""
+
+    def executar(self, programa, variaveis=None):
+        constantes = programa.constantes
+        valores = [valor_variavel(variaveis, nome) for nome in programa.variaveis]
+        locais = [None] * programa.num_locais
+        pilha = []
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+
+        for codigo, operando in zip(programa.codigos, programa.operandos):
+            if codigo == CONST:
+                empilhar(constantes[operando])
+            elif codigo == LOAD:
+                empilhar(locais[operando])
+            elif codigo == STORE:
+                locais[operando] = desempilhar()
+            elif codigo == VAR:
+                empilhar(valores[operando])
+            elif codigo == ADD:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] + direita
+            elif codigo == SUB:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] - direita
+            elif codigo == MUL:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] * direita
+            elif codigo == DIV:
+                direita = desempilhar()
+                if direita == 0:
+                    raise Exception("Erro: Divisão por zero")
+                pilha[-1] = pilha[-1] / direita
+            elif codigo == SHL:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] << direita
+
+        return pilha[-1]
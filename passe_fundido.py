@@ -0,0 +1,83 @@
+from geracao_codigo.gerador_tac import GeradorTAC
+from interpretador import aplicar_operacao, valor_variavel
+from semantico.analisador_semantico import ERRO_DIVISAO_ZERO
+from sintatico.nos_ast import NoNumero, NoVariavel, NoOperacaoBinaria
+
+
+class PasseFundido(GeradorTAC):
+    """Análise semântica, TAC, avaliação pela árvore e estatísticas da AST
+    numa única travessia.
+
+    Cada nó devolve o par (operando TAC, valor). O erro semântico interrompe
+    a travessia, como no AnalisadorSemantico; já um erro de avaliação
+    (divisão por zero em tempo de execução, variável sem valor) só fica
+    registrado em `erro`, com valor None daí para cima, para que um erro
+    semântico mais adiante na árvore continue tendo prioridade e o TAC
+    saia completo. Com `avaliar=False` o valor não é calculado (fica None),
+    para quem vai avaliar o código gerado. Com `compartilhar=True`, as
+    estatísticas contam cada nó compartilhado uma vez.
+    """
+
+    def __init__(self, compartilhar=False, cse=False, reservados=(), variaveis=None, avaliar=True):
+        super().__init__(compartilhar, cse, reservados)
+        self.variaveis = variaveis
+        self.avaliar = avaliar
+        self.erro = None
+        # Em ordem de avaliação (pós-ordem); as contagens de nós saem dos tamanhos
+        self.literais = []
+        self.operacoes = []
+        self.divisoes = []
+        self.num_variaveis = 0
+
+    def falhar(self, erro):
+        if self.erro is None:
+            self.erro = str(erro)
+
+    def estatisticas(self):
+        histograma = {}
+        for op in self.operacoes:
+            histograma[op] = histograma.get(op, 0) + 1
+        return {
+            'nos': {'NoNumero': len(self.literais), 'NoVariavel': self.num_variaveis,
+                    'NoOperacaoBinaria': len(self.operacoes)},
+            'operacoes': histograma,
+            'sequencia_operacoes': list(self.operacoes),
+            'divisoes': list(self.divisoes),
+            'literais': list(self.literais),
+        }
+
+    def visitar_NoNumero(self, no: NoNumero):
+        valor = no.valor
+        self.literais.append(valor)
+        return valor, valor
+
+    def visitar_NoVariavel(self, no: NoVariavel):
+        nome = no.nome
+        self.num_variaveis += 1
+        valor = None
+        if self.avaliar:
+            try:
+                valor = valor_variavel(self.variaveis, nome)
+            except Exception as e:
+                self.falhar(e)
+        return nome, valor
+
+    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria, esquerda, direita):
+        op = no.op
+        arg1, valor1 = esquerda
+        arg2, valor2 = direita
+        if op == '/':
+            # Operando que não é str é literal (temporários e variáveis são nomes)
+            if not isinstance(arg2, str) and arg2 == 0:
+                raise Exception(ERRO_DIVISAO_ZERO)
+            self.divisoes.append((no.esquerda if isinstance(arg1, str) else arg1,
+                                  no.direita if isinstance(arg2, str) else arg2))
+        self.operacoes.append(op)
+
+        valor = None
+        if self.avaliar and valor1 is not None and valor2 is not None:
+            try:
+                valor = aplicar_operacao(op, valor1, valor2)
+            except Exception as e:
+                self.falhar(e)
+        return super().visitar_NoOperacaoBinaria(no, arg1, arg2), valor
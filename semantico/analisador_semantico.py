@@ -1,23 +1,19 @@
-from sintatico.nos_ast import NoAST, NoNumero, NoOperacaoBinaria
+from sintatico.nos_ast import NoNumero, NoVariavel, NoOperacaoBinaria
+from sintatico.visitante import Visitante
 
+ERRO_DIVISAO_ZERO = "Erro semântico: Divisão por zero detectada"
 
-class AnalisadorSemantico:
-    def visitar(self, no: NoAST):
-        nome_metodo = f'visitar_{type(no).__name__}'
-        visitador = getattr(self, nome_metodo, self.visita_generica)
-        return visitador(no)
 
-    def visita_generica(self, no):
-        raise Exception(f'Método visitar_{type(no).__name__} não definido')
+class AnalisadorSemantico(Visitante):
 
     def visitar_NoNumero(self, no: NoNumero):
         return True
 
-    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria):
-        self.visitar(no.esquerda)
-        self.visitar(no.direita)
+    def visitar_NoVariavel(self, no: NoVariavel):
+        return True
 
+    def visitar_NoOperacaoBinaria(self, no: NoOperacaoBinaria, esquerda, direita):
         if no.op == '/' and isinstance(no.direita, NoNumero) and no.direita.valor == 0:
-            raise Exception("Erro semântico: Divisão por zero detectada")
+            raise Exception(ERRO_DIVISAO_ZERO)
 
-        return True
\ No newline at end of file
+        return True
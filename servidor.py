@@ -0,0 +1,334 @@
+"""Servidor local de avaliação de expressões, em asyncio.
+
+Protocolo de linhas: cada linha recebida é uma expressão, ou um objeto JSON
+{"id": ..., "expressao": "..."}; cada resposta é uma linha JSON com "id",
+"resultado" e "erro", na mesma ordem das requisições da conexão. A linha
+{"comando": "estatisticas"} devolve os contadores e o histograma de latência.
+Uma linha maior que `limite_linha` bytes recebe uma resposta de erro e é
+descartada, sem fechar a conexão.
+
+Requisições de todas as conexões entram numa fila limitada e são agrupadas
+em micro-lotes, avaliados num executor com poucas threads (cada uma com seu
+parser já construído). Fila cheia faz o servidor parar de ler das conexões,
+o que propaga a contrapressão até os clientes.
+
+Uso: python servidor.py [--host 127.0.0.1] [--porta 8765] [--unix caminho] [--limite-linha N]
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from compilador import Compilador
+from sintatico.registro import registro_global
+
+ERRO_TEMPO = "Erro: tempo limite esgotado"
+SEPARADOR = b'\n'
+
+
+class HistogramaLatencia:
+    """Contagens de latência em faixas fixas (em segundos), com percentis aproximados"""
+
+    limites = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+               0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        # A última faixa recebe tudo acima do maior limite
+        self.contagens = [0] * (len(self.limites) + 1)
+        self.total = 0
+        self.soma = 0.0
+
+    def registrar(self, latencia):
+        self.contagens[bisect.bisect_left(self.limites, latencia)] += 1
+        self.total += 1
+        self.soma += latencia
+
+    def percentil(self, p):
+        """Limite superior da faixa que contém o percentil `p` (0 a 100)"""
+        if not self.total:
+            return None
+        alvo = self.total * p / 100
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo and contagem:
+                return self.limites[indice] if indice < len(self.limites) else float('inf')
+        return float('inf')
+
+    def resumo(self):
+        return {
+            'total': self.total,
+            'media': self.soma / self.total if self.total else None,
+            'p50': self.percentil(50),
+            'p90': self.percentil(90),
+            'p99': self.percentil(99),
+            'faixas': {f"<={limite}": contagem
+                       for limite, contagem in zip(self.limites, self.contagens)},
+            'acima': self.contagens[-1],
+        }
+
+
+def _avaliar_lote(expressoes, opcoes):
+    saida = []
+    for expressao in expressoes:
+        try:
+            saida.append((Compilador(expressao, **opcoes).resultado, None))
+        except Exception as e:
+            saida.append((None, str(e)))
+    return saida
+
+
+def _aquecer():
+    registro_global.analisador().analisar("1 + 1")
+
+
+async def _descartar_linha(leitor):
+    """Descarta o resto de uma linha longa demais; False se a conexão acabar antes"""
+    while True:
+        try:
+            await leitor.readuntil(SEPARADOR)
+            return True
+        except asyncio.LimitOverrunError as e:
+            # Nada foi consumido: descarta o que já está no buffer e continua
+            await leitor.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return False
+
+
+class ServidorAvaliacao:
+    def __init__(self, tamanho_lote=64, espera_lote=0.001, trabalhadores=2, fila_maxima=1024,
+                 tempo_limite=5.0, limite_linha=1 << 20, **opcoes):
+        self.tamanho_lote = tamanho_lote
+        # Quanto o primeiro pedido de um lote espera por companhia
+        self.espera_lote = espera_lote
+        self.trabalhadores = trabalhadores
+        self.fila_maxima = fila_maxima
+        self.tempo_limite = tempo_limite
+        # Tamanho máximo, em bytes, de uma linha do protocolo (o buffer do StreamReader)
+        self.limite_linha = limite_linha
+        self.opcoes = opcoes
+        self.histograma = HistogramaLatencia()
+        self.requisicoes = 0
+        self.lotes = 0
+        self.erros = 0
+        self.tempos_esgotados = 0
+        self.servidor = None
+        self.endereco = None
+        self._fila = None
+        self._executor = None
+        self._vagas = None
+        self._agrupador = None
+        # Referências aos lotes em execução, para que as tarefas não sejam coletadas
+        self._em_execucao = set()
+
+    async def iniciar(self, host='127.0.0.1', porta=0, caminho=None):
+        """Abre o socket (TCP, ou Unix com `caminho`); porta 0 escolhe uma livre"""
+        self._fila = asyncio.Queue(self.fila_maxima)
+        self._executor = ThreadPoolExecutor(self.trabalhadores, initializer=_aquecer)
+        # Um lote em execução por thread; os seguintes esperam na fila
+        self._vagas = asyncio.Semaphore(self.trabalhadores)
+        self._agrupador = asyncio.create_task(self._agrupar())
+        if caminho is not None:
+            self.servidor = await asyncio.start_unix_server(self._atender, caminho,
+                                                            limit=self.limite_linha)
+            self.endereco = caminho
+        else:
+            self.servidor = await asyncio.start_server(self._atender, host, porta,
+                                                       limit=self.limite_linha)
+            self.endereco = self.servidor.sockets[0].getsockname()[:2]
+        return self.servidor
+
+    async def fechar(self):
+        self.servidor.close()
+        await self.servidor.wait_closed()
+        self._agrupador.cancel()
+        try:
+            await self._agrupador
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown(wait=True)
+
+    async def avaliar(self, expressao):
+        """Enfileira uma expressão e espera (resultado, erro); usável sem socket"""
+        inicio = time.perf_counter()
+        futuro = asyncio.get_running_loop().create_future()
+        await self._fila.put((expressao, futuro))
+        try:
+            resultado, erro = await asyncio.wait_for(futuro, self.tempo_limite)
+        except asyncio.TimeoutError:
+            resultado, erro = None, ERRO_TEMPO
+            self.tempos_esgotados += 1
+        self.requisicoes += 1
+        self.erros += erro is not None
+        self.histograma.registrar(time.perf_counter() - inicio)
+        return resultado, erro
+
+    async def _agrupar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._fila.get()]
+            prazo = loop.time() + self.espera_lote
+            while len(lote) < self.tamanho_lote:
+                # O que já está na fila entra sem espera; só então aguarda o prazo
+                if not self._fila.empty():
+                    lote.append(self._fila.get_nowait())
+                    continue
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            await self._vagas.acquire()
+            tarefa = asyncio.create_task(self._executar(lote))
+            self._em_execucao.add(tarefa)
+            tarefa.add_done_callback(self._em_execucao.discard)
+
+    async def _executar(self, lote):
+        try:
+            # Pedidos que já estouraram o tempo não precisam ser avaliados
+            lote = [(expressao, futuro) for expressao, futuro in lote if not futuro.done()]
+            if not lote:
+                return
+            self.lotes += 1
+            saidas = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _avaliar_lote, [expressao for expressao, _ in lote], self.opcoes)
+            for (_, futuro), saida in zip(lote, saidas):
+                if not futuro.done():
+                    futuro.set_result(saida)
+        except Exception as e:
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_result((None, str(e)))
+        finally:
+            self._vagas.release()
+
+    def estatisticas(self):
+        return {
+            'requisicoes': self.requisicoes,
+            'lotes': self.lotes,
+            'erros': self.erros,
+            'tempos_esgotados': self.tempos_esgotados,
+            'fila': self._fila.qsize() if self._fila is not None else 0,
+            'latencia': self.histograma.resumo(),
+        }
+
+    async def _atender(self, leitor, escritor):
+        # Respostas pendentes desta conexão, em ordem; limitada para não ler sem fim
+        respostas = asyncio.Queue(self.tamanho_lote)
+        tarefa_escrita = asyncio.create_task(self._escrever(respostas, escritor))
+        numero = 0
+        try:
+            while True:
+                try:
+                    linha = await leitor.readuntil(SEPARADOR)
+                except asyncio.IncompleteReadError as e:
+                    # Fim da conexão; a última linha pode vir sem '\n'
+                    linha = e.partial
+                except asyncio.LimitOverrunError:
+                    numero += 1
+                    await respostas.put(asyncio.create_task(self._responder_erro(
+                        numero, f"Erro: linha maior que {self.limite_linha} bytes")))
+                    if not await _descartar_linha(leitor):
+                        break
+                    continue
+                if not linha:
+                    break
+                texto = linha.decode('utf-8', errors='replace').strip()
+                if not texto:
+                    continue
+                numero += 1
+                await respostas.put(self._requisicao(numero, texto))
+        finally:
+            await respostas.put(None)
+            await tarefa_escrita
+            escritor.close()
+
+    def _requisicao(self, numero, texto):
+        """Tarefa que produz a resposta de uma linha do protocolo"""
+        identificador, expressao = numero, texto
+        if texto.startswith('{'):
+            try:
+                pedido = json.loads(texto)
+                if pedido.get('comando') == 'estatisticas':
+                    return asyncio.create_task(self._responder_estatisticas())
+                identificador = pedido.get('id', numero)
+                expressao = str(pedido['expressao'])
+            except (ValueError, KeyError, AttributeError) as e:
+                return asyncio.create_task(self._responder_erro(numero, f"Requisição inválida: {e}"))
+        return asyncio.create_task(self._responder(identificador, expressao))
+
+    async def _responder(self, identificador, expressao):
+        resultado, erro = await self.avaliar(expressao)
+        return {'id': identificador, 'resultado': resultado, 'erro': erro}
+
+    async def _responder_erro(self, identificador, erro):
+        return {'id': identificador, 'resultado': None, 'erro': erro}
+
+    async def _responder_estatisticas(self):
+        return self.estatisticas()
+
+    async def _escrever(self, respostas, escritor):
+        while True:
+            tarefa = await respostas.get()
+            if tarefa is None:
+                break
+            resposta = await tarefa
+            if escritor.is_closing():
+                # Cliente desconectou; as tarefas restantes só são esvaziadas
+                continue
+            escritor.write((json.dumps(resposta, ensure_ascii=False) + "\n").encode('utf-8'))
+            try:
+                await escritor.drain()
+            except ConnectionError:
+                pass
+
+
+async def consultar(expressoes, host='127.0.0.1', porta=8765, caminho=None):
+    """Cliente simples: envia as expressões numa conexão e devolve as respostas"""
+    if caminho is not None:
+        leitor, escritor = await asyncio.open_unix_connection(caminho)
+    else:
+        leitor, escritor = await asyncio.open_connection(host, porta)
+    expressoes = list(expressoes)
+    escritor.write("".join(expressao + "\n" for expressao in expressoes).encode('utf-8'))
+    await escritor.drain()
+    respostas = [json.loads(await leitor.readline()) for _ in expressoes]
+    escritor.close()
+    await escritor.wait_closed()
+    return respostas
+
+
+async def _servir(args):
+    servidor = ServidorAvaliacao(tamanho_lote=args.lote, trabalhadores=args.trabalhadores,
+                                 tempo_limite=args.tempo_limite, limite_linha=args.limite_linha,
+                                 avaliador=args.avaliador)
+    await servidor.iniciar(args.host, args.porta, args.unix)
+    print(f"Servindo em {servidor.endereco}")
+    async with servidor.servidor:
+        await servidor.servidor.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de avaliação de expressões")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--unix', help="caminho de um socket Unix, no lugar de TCP")
+    parser.add_argument('--lote', type=int, default=64)
+    parser.add_argument('--trabalhadores', type=int, default=2)
+    parser.add_argument('--tempo-limite', type=float, default=5.0)
+    parser.add_argument('--limite-linha', type=int, default=1 << 20,
+                        help="tamanho máximo de uma linha, em bytes")
+    parser.add_argument('--avaliador', choices=('vm', 'python', 'arvore'), default='vm')
+    args = parser.parse_args()
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from lexico.analisador_lexico import AnalisadorLexico
+from .nos_ast import FabricaNos
+
+
+class AnalisadorPrecedencia:
+    """Analisador por precedência de operadores, alternativo ao LALR do PLY.
+
+    Usa pilhas explícitas de operandos e operadores no lugar da recursão,
+    então a profundidade de parênteses não é limitada pela pilha do Python.
+    Produz as mesmas árvores (pela mesma fábrica de nós) e as mesmas
+    mensagens de erro do AnalisadorSintatico.
+    """
+
+    # tipo do token -> (operador, precedência); todos associam à esquerda
+    operadores = {
+        'MAIS': ('+', 1),
+        'MENOS': ('-', 1),
+        'VEZES': ('*', 2),
+        'DIVIDIR': ('/', 2),
+    }
+
+    def __init__(self, registro=None, diretorio_tabelas=None, analisador_lexico=None, fabrica=None):
+        if analisador_lexico is None:
+            if registro is None:
+                analisador_lexico = AnalisadorLexico(diretorio_tabelas=diretorio_tabelas)
+            else:
+                analisador_lexico = AnalisadorLexico(registro.obter_lexer())
+        self.analisador_lexico = analisador_lexico
+        self.fabrica = fabrica if fabrica is not None else FabricaNos()
+        self.ast = None
+
+    def erro(self, tok):
+        if tok:
+            raise Exception(f"Erro de sintaxe no token '{tok.value}' na posição {tok.lexpos}")
+        else:
+            raise Exception("Erro de sintaxe: fim inesperado da expressão")
+
+    def reduzir(self, operandos, operador):
+        op, _, posicao = operador
+        direita = operandos.pop()
+        operandos.append(self.fabrica.operacao(op, operandos.pop(), direita, posicao))
+
+    def analisar(self, texto):
+        lexico = self.analisador_lexico
+        operadores = self.operadores
+        pilha_operandos = []
+        # Cada entrada é (operador, precedência, posição); None marca um '(' aberto
+        pilha_operadores = []
+
+        lexico.input(texto)
+        tok = lexico.token()
+        while True:
+            # Espera um operando, possivelmente precedido de '('
+            while tok and tok.type == 'PAREN_ESQ':
+                pilha_operadores.append(None)
+                tok = lexico.token()
+            if not tok:
+                self.erro(tok)
+            if tok.type == 'NUMERO':
+                pilha_operandos.append(self.fabrica.numero(tok.value, tok.lexpos))
+            elif tok.type == 'IDENTIFICADOR':
+                pilha_operandos.append(self.fabrica.variavel(tok.value, tok.lexpos))
+            else:
+                self.erro(tok)
+            tok = lexico.token()
+
+            # Depois do operando: ')', operador binário ou fim
+            while tok and tok.type == 'PAREN_DIR':
+                while pilha_operadores and pilha_operadores[-1] is not None:
+                    self.reduzir(pilha_operandos, pilha_operadores.pop())
+                if not pilha_operadores:
+                    self.erro(tok)
+                pilha_operadores.pop()
+                tok = lexico.token()
+            if not tok:
+                break
+
+            operador = operadores.get(tok.type)
+            if operador is None:
+                self.erro(tok)
+            precedencia = operador[1]
+            while pilha_operadores and pilha_operadores[-1] is not None \
+                    and pilha_operadores[-1][1] >= precedencia:
+                self.reduzir(pilha_operandos, pilha_operadores.pop())
+            pilha_operadores.append((operador[0], precedencia, tok.lexpos))
+            tok = lexico.token()
+
+        while pilha_operadores:
+            operador = pilha_operadores.pop()
+            if operador is None:
+                self.erro(None)
+            self.reduzir(pilha_operandos, operador)
+
+        self.ast = pilha_operandos[0]
+        return self.ast
+
+    def obter_tokens(self):
+        return self.analisador_lexico.tokens_list
@@ -1,6 +1,10 @@
-import ply.yacc as yacc
+import filecmp
+import os
+import shutil
+import tempfile
+
 from lexico.analisador_lexico import AnalisadorLexico
-from .nos_ast import NoNumero, NoOperacaoBinaria
+from .nos_ast import FabricaNos
 
 
 class AnalisadorSintatico:
@@ -10,12 +14,58 @@ class AnalisadorSintatico:
         ('left', 'VEZES', 'DIVIDIR'),
     )
 
-    def __init__(self):
-        self.analisador_lexico = AnalisadorLexico()
-        self.parser = yacc.yacc(module=self, debug=False, write_tables=False)
+    def __init__(self, registro=None, diretorio_tabelas=None, analisador_lexico=None, fabrica=None):
+        if analisador_lexico is None:
+            if registro is None:
+                analisador_lexico = AnalisadorLexico(diretorio_tabelas=diretorio_tabelas)
+            else:
+                analisador_lexico = AnalisadorLexico(registro.obter_lexer())
+        self.analisador_lexico = analisador_lexico
+
+        if registro is None:
+            self.parser = self._construir_parser(diretorio_tabelas)
+        else:
+            self.parser = registro.obter_parser()
+        self.fabrica = fabrica if fabrica is not None else FabricaNos()
         self.ast = None
 
-    # Regras gramaticais
+    def _construir_parser(self, diretorio_tabelas):
+        # Importado só aqui para que carregar o módulo não custe o import do PLY
+        import ply.yacc as yacc
+
+        if diretorio_tabelas is None:
+            return yacc.yacc(module=self, debug=False, write_tables=False)
+
+        # O PLY compara a assinatura da gramática (docstrings e precedência)
+        # com a gravada no arquivo e regenera as tabelas quando diferem. Como
+        # ele regrava o mesmo arquivo que lê, recebe uma cópia temporária, que
+        # só substitui a definitiva (com os.replace, atômico) se mudou
+        os.makedirs(diretorio_tabelas, exist_ok=True)
+        arquivo = os.path.join(diretorio_tabelas, 'parsetab.pickle')
+        descritor, temporario = tempfile.mkstemp(dir=diretorio_tabelas, suffix='.tmp')
+        os.close(descritor)
+        try:
+            existia = os.path.exists(arquivo)
+            if existia:
+                shutil.copyfile(arquivo, temporario)
+            else:
+                os.remove(temporario)
+            try:
+                parser = yacc.yacc(module=self, debug=False, picklefile=temporario)
+            except Exception:
+                # Tabela truncada ou corrompida: é tratada como velha e regenerada
+                os.remove(temporario)
+                parser = yacc.yacc(module=self, debug=False, picklefile=temporario)
+            if not existia or not filecmp.cmp(temporario, arquivo, shallow=False):
+                os.replace(temporario, arquivo)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        return parser
+
+    # Regras gramaticais. Com o registro, as ações ficam ligadas à instância
+    # base compartilhada, então a fábrica de nós é lida do parser (p.parser),
+    # que é próprio de cada thread e recebe a fábrica em analisar()
     def p_expressao(self, p):
         """expressao : termo"""
         p[0] = p[1]
@@ -23,12 +73,12 @@ class AnalisadorSintatico:
     def p_expressao_binaria(self, p):
         """expressao : expressao MAIS expressao
                      | expressao MENOS expressao"""
-        p[0] = NoOperacaoBinaria(p[2], p[1], p[3])
+        p[0] = p.parser.fabrica.operacao(p[2], p[1], p[3], p.lexpos(2))
 
     def p_termo_binario(self, p):
         """termo : termo VEZES termo
                  | termo DIVIDIR termo"""
-        p[0] = NoOperacaoBinaria(p[2], p[1], p[3])
+        p[0] = p.parser.fabrica.operacao(p[2], p[1], p[3], p.lexpos(2))
 
     def p_termo_fator(self, p):
         """termo : fator"""
@@ -36,7 +86,11 @@ class AnalisadorSintatico:
 
     def p_fator_numero(self, p):
         """fator : NUMERO"""
-        p[0] = NoNumero(p[1])
+        p[0] = p.parser.fabrica.numero(p[1], p.lexpos(1))
+
+    def p_fator_identificador(self, p):
+        """fator : IDENTIFICADOR"""
+        p[0] = p.parser.fabrica.variavel(p[1], p.lexpos(1))
 
     def p_fator_parenteses(self, p):
         """fator : PAREN_ESQ expressao PAREN_DIR"""
@@ -49,8 +103,8 @@ class AnalisadorSintatico:
             raise Exception("Erro de sintaxe: fim inesperado da expressão")
 
     def analisar(self, texto):
-        lexer = self.analisador_lexico.obter_lexer()
-        self.ast = self.parser.parse(texto, lexer=lexer)
+        self.parser.fabrica = self.fabrica
+        self.ast = self.parser.parse(texto, lexer=self.analisador_lexico)
         return self.ast
 
     def obter_tokens(self):
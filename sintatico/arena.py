@@ -0,0 +1,157 @@
+from array import array
+
+from .nos_ast import NoNumero, NoVariavel, NoOperacaoBinaria, chave_constante
+
+NUMERO = 0
+VARIAVEL = 5
+OPCODES = {'+': 1, '-': 2, '*': 3, '/': 4}
+OPERADORES = {codigo: op for op, codigo in OPCODES.items()}
+
+
+class ArenaAST:
+    """AST guardada em arrays paralelos: opcode, índice do filho esquerdo,
+    índice do filho direito e índice da constante (o valor de um número ou o
+    nome de uma variável).
+
+    Os filhos sempre vêm antes dos pais, então percorrer os índices em ordem
+    crescente já é uma pós-ordem. Implementa a interface de FabricaNos, então
+    os analisadores sintáticos podem construí-la diretamente. Com
+    `compartilhar=True` faz hash-consing como a FabricaCompartilhada.
+    """
+
+    comutativos = frozenset((OPCODES['+'], OPCODES['*']))
+
+    def __init__(self, compartilhar=False):
+        self.opcodes = array('B')
+        self.esquerda = array('l')
+        self.direita = array('l')
+        self.constante = array('l')
+        self.constantes = []
+        self._indice_constante = {}
+        self._nos = {} if compartilhar else None
+        self.raiz = -1
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def _constante(self, valor):
+        chave = chave_constante(valor)
+        indice_constante = self._indice_constante.get(chave)
+        if indice_constante is None:
+            indice_constante = len(self.constantes)
+            self.constantes.append(valor)
+            self._indice_constante[chave] = indice_constante
+        return indice_constante
+
+    def numero(self, valor, posicao=None):
+        indice_constante = self._constante(valor)
+        return self._adicionar(NUMERO, -1, -1, indice_constante, (NUMERO, indice_constante))
+
+    def variavel(self, nome, posicao=None):
+        indice_constante = self._constante(nome)
+        return self._adicionar(VARIAVEL, -1, -1, indice_constante, (VARIAVEL, indice_constante))
+
+    def operacao(self, op, esquerda, direita, posicao=None):
+        opcode = OPCODES[op]
+        if opcode in self.comutativos and direita < esquerda:
+            chave = (opcode, direita, esquerda)
+        else:
+            chave = (opcode, esquerda, direita)
+        return self._adicionar(opcode, esquerda, direita, -1, chave)
+
+    def _adicionar(self, opcode, esquerda, direita, constante, chave):
+        if self._nos is not None:
+            indice = self._nos.get(chave)
+            if indice is not None:
+                self.raiz = indice
+                return indice
+            self._nos[chave] = len(self.opcodes)
+
+        self.opcodes.append(opcode)
+        self.esquerda.append(esquerda)
+        self.direita.append(direita)
+        self.constante.append(constante)
+        self.raiz = len(self.opcodes) - 1
+        return self.raiz
+
+    def no(self, indice=None):
+        """Visão do nó `indice` (por padrão, a raiz) com a interface dos nós da AST"""
+        if indice is None:
+            indice = self.raiz
+        opcode = self.opcodes[indice]
+        if opcode == NUMERO:
+            return VisaoNumero(self, indice)
+        if opcode == VARIAVEL:
+            return VisaoVariavel(self, indice)
+        return VisaoOperacao(self, indice)
+
+    def aceitar(self, visitante):
+        """Roda um Visitante direto sobre os arrays, sem percorrer ponteiros"""
+        metodo_numero = visitante._metodo(VisaoNumero)
+        metodo_variavel = visitante._metodo(VisaoVariavel)
+        metodo_operacao = visitante._metodo(VisaoOperacao)
+        esquerda = self.esquerda
+        direita = self.direita
+        resultados = []
+        guardar = resultados.append
+
+        for indice, opcode in enumerate(self.opcodes):
+            if opcode == NUMERO:
+                guardar(metodo_numero(visitante, VisaoNumero(self, indice)))
+            elif opcode == VARIAVEL:
+                guardar(metodo_variavel(visitante, VisaoVariavel(self, indice)))
+            else:
+                guardar(metodo_operacao(visitante, VisaoOperacao(self, indice),
+                                        resultados[esquerda[indice]], resultados[direita[indice]]))
+
+        return resultados[self.raiz]
+
+
+class VisaoNumero(NoNumero):
+    """NoNumero que lê o valor da arena"""
+
+    __slots__ = ('arena', 'indice')
+
+    def __init__(self, arena, indice):
+        self.arena = arena
+        self.indice = indice
+
+    @property
+    def valor(self):
+        return self.arena.constantes[self.arena.constante[self.indice]]
+
+
+class VisaoVariavel(NoVariavel):
+    """NoVariavel que lê o nome da arena"""
+
+    __slots__ = ('arena', 'indice')
+
+    def __init__(self, arena, indice):
+        self.arena = arena
+        self.indice = indice
+
+    @property
+    def nome(self):
+        return self.arena.constantes[self.arena.constante[self.indice]]
+
+
+class VisaoOperacao(NoOperacaoBinaria):
+    """NoOperacaoBinaria que lê operador e filhos da arena"""
+
+    __slots__ = ('arena', 'indice')
+
+    def __init__(self, arena, indice):
+        self.arena = arena
+        self.indice = indice
+
+    @property
+    def op(self):
+        return OPERADORES[self.arena.opcodes[self.indice]]
+
+    @property
+    def esquerda(self):
+        return self.arena.no(self.arena.esquerda[self.indice])
+
+    @property
+    def direita(self):
+        return self.arena.no(self.arena.direita[self.indice])
@@ -0,0 +1,88 @@
+import operator
+
+from semantico.analisador_semantico import ERRO_DIVISAO_ZERO
+from .nos_ast import FabricaNos, NoNumero
+
+OPERACOES = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+
+
+class Constante(NoNumero):
+    """Número conhecido já na análise: um literal ou o resultado de dobrar
+    uma operação entre constantes.
+
+    Guarda a procedência: o operador dobrado (None para um literal), a
+    posição dele e o intervalo de posições do primeiro ao último token da
+    subexpressão (a mesma convenção do lexspan do PLY).
+    """
+
+    __slots__ = ('op', 'posicao', 'inicio', 'fim')
+
+    def __init__(self, valor, op, posicao, inicio, fim):
+        super().__init__(valor)
+        self.op = op
+        self.posicao = posicao
+        self.inicio = inicio
+        self.fim = fim
+
+
+class FabricaDobramento:
+    """Fábrica que dobra constantes à medida que o analisador reduz a expressão.
+
+    Uma operação entre duas constantes não cria nó: vira uma Constante com
+    o valor calculado (int com int dá int, exceto na divisão, como na
+    avaliação). Divisão por uma constante zero é erro já aqui, com a
+    procedência do divisor na mensagem; operações que estourariam (por
+    exemplo, um int grande demais para float) ficam para a execução.
+
+    As demais chamadas vão para a fábrica `base`. Sem `base`, as Constantes
+    ficam na própria árvore (são NoNumero); com uma base (como a
+    FabricaCompartilhada ou a ArenaAST), viram números dela ao entrar numa
+    operação não dobrada, e `no()` converte a raiz.
+    """
+
+    def __init__(self, base=None):
+        self.converter = base is not None
+        self.base = base if base is not None else FabricaNos()
+        # Operações eliminadas
+        self.dobras = 0
+
+    def numero(self, valor, posicao=None):
+        return Constante(valor, None, posicao, posicao, posicao)
+
+    def variavel(self, nome, posicao=None):
+        return self.base.variavel(nome, posicao)
+
+    def operacao(self, op, esquerda, direita, posicao=None):
+        constante_direita = type(direita) is Constante
+        if op == '/' and constante_direita and direita.valor == 0:
+            raise Exception(self.erro_divisao(posicao, direita))
+
+        if constante_direita and type(esquerda) is Constante:
+            try:
+                valor = OPERACOES[op](esquerda.valor, direita.valor)
+            except ArithmeticError:
+                pass
+            else:
+                self.dobras += 1
+                return Constante(valor, op, posicao, esquerda.inicio, direita.fim)
+
+        return self.base.operacao(op, self.no(esquerda), self.no(direita), posicao)
+
+    def no(self, item):
+        """Nó (ou índice) da fábrica base correspondente a `item`"""
+        if self.converter and type(item) is Constante:
+            return self.base.numero(item.valor, item.inicio)
+        return item
+
+    @staticmethod
+    def erro_divisao(posicao, divisor):
+        mensagem = f"{ERRO_DIVISAO_ZERO} na posição {posicao}"
+        if divisor.op is not None:
+            mensagem += (f" (divisor obtido dobrando '{divisor.op}' "
+                         f"entre as posições {divisor.inicio} e {divisor.fim})")
+        return mensagem
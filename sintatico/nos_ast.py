@@ -1,8 +1,26 @@
+import math
+
+
+def chave_constante(valor):
+    """Chave para internar um número (ou nome) num dicionário.
+
+    1 e 1.0 têm o mesmo hash, e 0.0 == -0.0, então o tipo e, para floats,
+    o sinal entram na chave.
+    """
+    if type(valor) is float:
+        return (float, valor, math.copysign(1, valor))
+    return (type(valor), valor)
+
+
 class NoAST:
-    pass
+    __slots__ = ()
+
+    # Atributos que guardam os nós filhos, na ordem de visita
+    campos = ()
 
 
 class NoNumero(NoAST):
+    __slots__ = ('valor',)
 
     def __init__(self, valor):
         self.valor = valor
@@ -11,11 +29,92 @@ class NoNumero(NoAST):
         return f"Num({self.valor})"
 
 
+class NoVariavel(NoAST):
+    __slots__ = ('nome',)
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __repr__(self):
+        return f"Var({self.nome})"
+
+
 class NoOperacaoBinaria(NoAST):
+    __slots__ = ('op', 'esquerda', 'direita')
+    campos = ('esquerda', 'direita')
+
     def __init__(self, op, esquerda, direita):
         self.op = op
         self.esquerda = esquerda
         self.direita = direita
 
     def __repr__(self):
-        return f"BinOp({self.esquerda} {self.op} {self.direita})"
\ No newline at end of file
+        # Montado com pilha explícita para não estourar a recursão em árvores profundas
+        partes = []
+        pilha = [self]
+        while pilha:
+            item = pilha.pop()
+            if isinstance(item, NoOperacaoBinaria):
+                pilha.extend((")", item.direita, f" {item.op} ", item.esquerda, "BinOp("))
+            elif isinstance(item, str):
+                partes.append(item)
+            else:
+                partes.append(repr(item))
+        return "".join(partes)
+
+
+class FabricaNos:
+    """Cria os nós a partir das reduções dos analisadores sintáticos.
+
+    Outras representações (como a ArenaAST) implementam os mesmos métodos.
+    `posicao` é a do token (o número, o nome ou o operador) no texto; só é
+    usada por fábricas que a registram, como a FabricaDobramento.
+    """
+
+    def numero(self, valor, posicao=None):
+        return NoNumero(valor)
+
+    def variavel(self, nome, posicao=None):
+        return NoVariavel(nome)
+
+    def operacao(self, op, esquerda, direita, posicao=None):
+        return NoOperacaoBinaria(op, esquerda, direita)
+
+
+class FabricaCompartilhada(FabricaNos):
+    """Fábrica com hash-consing: subárvores estruturalmente iguais viram o
+    mesmo objeto, transformando a árvore em um DAG.
+
+    Como `+` e `*` são comutativos (inclusive em ponto flutuante), `a + b`
+    e `b + a` compartilham o mesmo nó.
+    """
+
+    comutativos = frozenset('+*')
+
+    def __init__(self):
+        self.nos = {}
+
+    def numero(self, valor, posicao=None):
+        chave = chave_constante(valor)
+        no = self.nos.get(chave)
+        if no is None:
+            no = self.nos[chave] = NoNumero(valor)
+        return no
+
+    def variavel(self, nome, posicao=None):
+        chave = (str, nome)
+        no = self.nos.get(chave)
+        if no is None:
+            no = self.nos[chave] = NoVariavel(nome)
+        return no
+
+    def operacao(self, op, esquerda, direita, posicao=None):
+        # Os filhos já são únicos, então a identidade deles basta como chave
+        id_esquerda, id_direita = id(esquerda), id(direita)
+        if op in self.comutativos and id_direita < id_esquerda:
+            id_esquerda, id_direita = id_direita, id_esquerda
+        chave = (op, id_esquerda, id_direita)
+        no = self.nos.get(chave)
+        if no is None:
+            no = self.nos[chave] = NoOperacaoBinaria(op, esquerda, direita)
+        return no
@@ -0,0 +1,75 @@
+import copy
+import os
+import sys
+import threading
+
+from lexico.analisador_lexico import AnalisadorLexico
+from lexico.analisador_lexico_rapido import AnalisadorLexicoRapido
+from .analisador_precedencia import AnalisadorPrecedencia
+from .analisador_sintatico import AnalisadorSintatico
+
+ANALISADORES = {
+    'ply': AnalisadorSintatico,
+    'precedencia': AnalisadorPrecedencia,
+}
+
+
+class RegistroAnalisadores:
+    """Constrói as tabelas LALR e a regex do lexer uma única vez por processo.
+
+    O lexer e o parser do PLY guardam estado da análise em andamento, então
+    cada thread recebe sua própria cópia, criada a partir dos objetos base.
+    Com `diretorio_tabelas`, as tabelas pré-computadas são lidas do disco
+    (e geradas lá na primeira vez).
+    """
+
+    def __init__(self, diretorio_tabelas=None):
+        self.diretorio_tabelas = diretorio_tabelas
+        self._trava = threading.Lock()
+        self._locais = threading.local()
+        self._lexer_base = None
+        self._parser_base = None
+
+    def _construir_lexer(self):
+        with self._trava:
+            if self._lexer_base is None:
+                self._lexer_base = AnalisadorLexico(diretorio_tabelas=self.diretorio_tabelas).lexer
+
+    def _construir_parser(self):
+        with self._trava:
+            if self._parser_base is None:
+                base = AnalisadorSintatico(diretorio_tabelas=self.diretorio_tabelas)
+                self._parser_base = base.parser
+                if self._lexer_base is None:
+                    self._lexer_base = base.analisador_lexico.lexer
+
+    def obter_lexer(self):
+        lexer = getattr(self._locais, 'lexer', None)
+        if lexer is None:
+            if self._lexer_base is None:
+                self._construir_lexer()
+            lexer = self._lexer_base.clone()
+            self._locais.lexer = lexer
+        return lexer
+
+    def obter_parser(self):
+        parser = getattr(self._locais, 'parser', None)
+        if parser is None:
+            if self._parser_base is None:
+                self._construir_parser()
+            # As tabelas são somente leitura; a cópia rasa separa só as pilhas
+            parser = copy.copy(self._parser_base)
+            self._locais.parser = parser
+        return parser
+
+    def analisador(self, tipo='ply', lexico='ply', fabrica=None):
+        analisador_lexico = AnalisadorLexicoRapido() if lexico == 'rapido' else None
+        return ANALISADORES[tipo](self, analisador_lexico=analisador_lexico, fabrica=fabrica)
+
+
+registro_global = RegistroAnalisadores(os.environ.get('COMPILADOR_TABELAS'))
+
+
+if __name__ == "__main__":
+    # Pré-gera as tabelas: python -m sintatico.registro <diretorio>
+    RegistroAnalisadores(sys.argv[1]).analisador()
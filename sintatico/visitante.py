@@ -0,0 +1,142 @@
+# Marca na pilha de visita: o nó logo abaixo já teve os filhos visitados
+_COMBINAR = object()
+
+
+class Visitante:
+    """Base dos passes sobre a AST.
+
+    Percorre a árvore em pós-ordem com uma pilha explícita, então a
+    profundidade da árvore não é limitada pela pilha do Python. Cada nó é
+    despachado para `visitar_<NomeDaClasse>`, que recebe o nó seguido dos
+    resultados já calculados para os filhos. Método e campos filhos ficam em
+    uma tabela por classe de visitante, indexada pela classe do nó.
+
+    Com `compartilhar=True` a entrada pode ser um DAG (por exemplo, vinda da
+    FabricaCompartilhada): cada nó compartilhado é visitado uma única vez e
+    o resultado é reaproveitado nas outras ocorrências.
+    """
+
+    def __init__(self, compartilhar=False):
+        self.compartilhar = compartilhar
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._despacho = {}
+
+    _despacho = {}
+
+    @classmethod
+    def _resolver(cls, tipo_no):
+        metodo = None
+        # Percorre a MRO para que subclasses de nós usem o método da base
+        for classe in tipo_no.__mro__:
+            metodo = getattr(cls, f'visitar_{classe.__name__}', None)
+            if metodo is not None:
+                break
+        if metodo is None:
+            metodo = cls.visita_generica
+        cls._despacho[tipo_no] = entrada = (metodo, tipo_no.campos)
+        return entrada
+
+    @classmethod
+    def _metodo(cls, tipo_no):
+        return (cls._despacho.get(tipo_no) or cls._resolver(tipo_no))[0]
+
+    def visita_generica(self, no, *filhos):
+        raise Exception(f'Método visitar_{type(no).__name__} não definido')
+
+    def visitar(self, raiz):
+        if self.compartilhar:
+            return self._visitar_dag(raiz)
+
+        despacho = self._despacho
+        resolver = self._resolver
+        pilha = [raiz]
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        resultados = []
+        guardar = resultados.append
+
+        while pilha:
+            item = desempilhar()
+
+            # Os filhos do nó abaixo da marca já foram visitados: combina
+            if item is _COMBINAR:
+                no = desempilhar()
+                metodo, campos = despacho[type(no)]
+                if len(campos) == 2:
+                    direita = resultados.pop()
+                    resultados[-1] = metodo(self, no, resultados[-1], direita)
+                else:
+                    filhos = resultados[-len(campos):]
+                    del resultados[-len(campos):]
+                    guardar(metodo(self, no, *filhos))
+                continue
+
+            tipo = type(item)
+            metodo, campos = despacho.get(tipo) or resolver(tipo)
+            if not campos:
+                guardar(metodo(self, item))
+                continue
+
+            empilhar(item)
+            empilhar(_COMBINAR)
+            if len(campos) == 2:
+                empilhar(getattr(item, campos[1]))
+                empilhar(getattr(item, campos[0]))
+            else:
+                for campo in reversed(campos):
+                    empilhar(getattr(item, campo))
+
+        return resultados[0]
+
+    def _visitar_dag(self, raiz):
+        despacho = self._despacho
+        resolver = self._resolver
+        pilha = [raiz]
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        resultados = []
+        guardar = resultados.append
+        memoria = {}
+
+        while pilha:
+            item = desempilhar()
+
+            if item is _COMBINAR:
+                no = desempilhar()
+                metodo, campos = despacho[type(no)]
+                filhos = resultados[-len(campos):]
+                del resultados[-len(campos):]
+                resultado = memoria[id(no)] = metodo(self, no, *filhos)
+                guardar(resultado)
+                continue
+
+            if id(item) in memoria:
+                guardar(memoria[id(item)])
+                continue
+
+            metodo, campos = despacho.get(type(item)) or resolver(type(item))
+            if not campos:
+                resultado = memoria[id(item)] = metodo(self, item)
+                guardar(resultado)
+                continue
+
+            empilhar(item)
+            empilhar(_COMBINAR)
+            for campo in reversed(campos):
+                empilhar(getattr(item, campo))
+
+        return resultados[0]
+
+
+def percorrer(raiz):
+    """Gera os nós da árvore em pré-ordem (esquerda antes da direita), sem recursão"""
+    if raiz is None:
+        return
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        yield no
+        for campo in reversed(no.campos):
+            pilha.append(getattr(no, campo))